@@ -4,17 +4,30 @@ import json
 import logging
 from pathlib import Path
 
+import voluptuous as vol
 from homeassistant.components.frontend import add_extra_js_url
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import Event, HomeAssistant
 from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, Platform
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
 from .const import (
+    CONF_LEAN,
+    DEFAULT_LEAN,
     DOMAIN,
     FRONTEND_CARD_FILENAME,
     FRONTEND_URL_BASE,
+    LEAN_PLATFORMS,
     PLATFORMS,
+    SIGNAL_SCHEDULER_CHANGED,
 )
+from .bulk import async_register_services
+from .catchup import async_startup_pass
+from .registry import async_prune_entities
+from .revisions import async_get_revision_log
+from .store import async_get_runtime_store
+from .throttle import CONF_DISPATCH, DISPATCH_SCHEMA, async_get_dispatch_throttle
+from .runtime_actions import detect_device_type
 from .scheduler import ARScheduler
 from .websocket import async_register_ws
 
@@ -22,6 +35,18 @@ _LOGGER = logging.getLogger(__name__)
 
 _FRONTEND_FLAG = f"{DOMAIN}_frontend_registered"
 
+# Everything is configured per entry in the UI; the only YAML is the
+# optional, integration-wide dispatch pacing (see throttle.py).
+CONFIG_SCHEMA = vol.Schema(
+    {
+        # A bare `ar_smart_scheduler:` line (no options) parses as None.
+        vol.Optional(DOMAIN, default={}): vol.Any(
+            None, vol.Schema({vol.Optional(CONF_DISPATCH, default={}): DISPATCH_SCHEMA})
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 
 def _card_version() -> str:
     """Read the integration version out of manifest.json.
@@ -206,44 +231,91 @@ async def _async_register_frontend(hass: HomeAssistant) -> None:
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     hass.data.setdefault(DOMAIN, {})
+    # Loaded once for every scheduler, before any entry is set up.
+    await async_get_runtime_store(hass).async_load()
+    async_get_dispatch_throttle(hass).async_configure((config.get(DOMAIN) or {}).get(CONF_DISPATCH, {}))
+    if not hass.is_running:
+        # One pass over every scheduler for fires missed while HA was down
+        # and for opted-in in-window reconciliation, once all entries are
+        # set up (see catchup.py).
+        async def _async_startup_pass(_event: Event) -> None:
+            await async_startup_pass(hass)
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_startup_pass)
     async_register_ws(hass)
+    async_register_services(hass)
     await _async_register_frontend(hass)
     return True
 
 
+def _platforms_for(entry: ConfigEntry) -> list[Platform]:
+    """Platforms to set up for this entry - see LEAN_PLATFORMS."""
+    lean = bool(entry.options.get(CONF_LEAN, DEFAULT_LEAN))
+    return [Platform(p) for p in (LEAN_PLATFORMS if lean else PLATFORMS)]
+
+
+def _entities_changed(entry: ConfigEntry, scheduler: ARScheduler) -> bool:
+    """Whether lean mode or (outside lean mode) the resolved device type changed."""
+    platforms = _platforms_for(entry)
+    if platforms != scheduler.platforms:
+        return True
+    if Platform.SELECT not in platforms and Platform.NUMBER not in platforms:
+        return False
+    return detect_device_type(entry.options, entry.data) != scheduler.entity_device_type
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     scheduler = ARScheduler(hass, entry)
+    # Remembered so unload (and the lean-mode check in _async_update_entry)
+    # works from what was actually set up, not from the current options.
+    scheduler.platforms = _platforms_for(entry)
+    scheduler.entity_device_type = scheduler.plan.device_type
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = scheduler
     entry.async_on_unload(entry.add_update_listener(_async_update_entry))
 
     await scheduler.async_start()
 
-    await hass.config_entries.async_forward_entry_setups(
-        entry, [Platform(p) for p in PLATFORMS]
-    )
+    # Entities from platforms this entry no longer loads (lean mode was
+    # switched on) would otherwise linger as "no longer provided".
+    platform_domains = {str(platform) for platform in scheduler.platforms}
+    async_prune_entities(hass, entry, lambda reg_entry: reg_entry.domain in platform_domains)
+
+    await hass.config_entries.async_forward_entry_setups(entry, scheduler.platforms)
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    unload_ok = await hass.config_entries.async_unload_platforms(
-        entry, [Platform(p) for p in PLATFORMS]
-    )
+    scheduler: ARScheduler | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    platforms = scheduler.platforms if scheduler is not None else _platforms_for(entry)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
 
     if unload_ok:
-        scheduler: ARScheduler | None = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
         if scheduler is not None:
             await scheduler.async_stop()
+            async_get_revision_log(hass).record_removed(entry.entry_id)
+            async_dispatcher_send(hass, SIGNAL_SCHEDULER_CHANGED, entry.entry_id)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget a deleted scheduler's persisted runtime state."""
+    async_get_runtime_store(hass).async_remove(entry.entry_id)
+
+
 async def _async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload scheduler state when config entry data or options change."""
     scheduler: ARScheduler | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
-    if scheduler is not None:
-        await scheduler.async_reload_from_entry()
+    if scheduler is None:
+        return
+    if _entities_changed(entry, scheduler):
+        # The entity set itself changes, which only a full entry reload can do.
+        hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+        return
+    await scheduler.async_reload_from_entry()
 
 
 # -----------------------------
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Optional
+
+from .const import CONF_IDEMPOTENT, CONF_TARGET_ENTITY, CONF_VERIFY, DEFAULT_IDEMPOTENT, DEFAULT_VERIFY
+from .dispatch import freeze
+from .runtime_actions import action_snapshot, detect_device_type, normalize_entity_ids, state_checkable
+
+_NO_DATA: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class PlannedCall:
+    """One service call of an action, for the targets of one entity domain."""
+
+    domain: str
+    service: str
+    data: Mapping[str, Any]
+    entity_ids: tuple[str, ...]
+    # ServiceBatch merge key, worked out once instead of on every fire.
+    key: tuple
+
+    def restricted(self, entity_ids: Iterable[str]) -> Optional[PlannedCall]:
+        """This call for just the given targets (None if that leaves none)."""
+        wanted = set(entity_ids)
+        kept = tuple(entity_id for entity_id in self.entity_ids if entity_id in wanted)
+        if kept == self.entity_ids:
+            return self
+        if not kept:
+            return None
+        return PlannedCall(self.domain, self.service, self.data, kept, self.key)
+
+
+@dataclass(frozen=True)
+class PlannedAction:
+    """A start or end action, resolved to the calls a fire makes."""
+
+    # Bare service name (no domain) and data, as already_satisfied() and
+    # verified dispatch judge them.
+    service: str
+    data: Mapping[str, Any]
+    checkable: bool
+    calls: tuple[PlannedCall, ...]
+
+
+@dataclass(frozen=True)
+class ActionPlan:
+    """Everything a fire or an entity read needs, compiled once per _load.
+
+    Each fire used to split the service string, re-normalize the entry's
+    targets, regroup them by domain and copy the payload per domain, and
+    every snapshot build and action number/select `available` read ran
+    detect_device_type() again. ARScheduler._load now compiles this once
+    per entry change, and everything else just reads it. Treat it as
+    read-only: it's shared by every reader until the next reload.
+    """
+
+    device_type: str
+    targets: tuple[str, ...]
+    target_set: frozenset[str]
+    # action_snapshot() for the card; copied into each (memoized) snapshot.
+    actions: Mapping[str, Any]
+    start: PlannedAction
+    end: PlannedAction
+    # Per-fire dispatch options (CONF_IDEMPOTENT, CONF_VERIFY).
+    idempotent: bool
+    verify: bool
+
+
+def _compile_action(service: str, data: Any, targets: tuple[str, ...]) -> PlannedAction:
+    if "." in service:
+        domain, service = service.split(".", 1)
+    else:
+        domain = None
+    frozen_data = MappingProxyType(dict(data)) if isinstance(data, dict) and data else _NO_DATA
+    data_key = freeze(dict(frozen_data))
+
+    by_domain: dict[str, list[str]] = {}
+    for entity_id in targets:
+        by_domain.setdefault(domain or entity_id.split(".", 1)[0], []).append(entity_id)
+
+    return PlannedAction(
+        service=service,
+        data=frozen_data,
+        checkable=state_checkable(service, frozen_data),
+        calls=tuple(
+            PlannedCall(call_domain, service, frozen_data, tuple(entity_ids), (call_domain, service, data_key))
+            for call_domain, entity_ids in by_domain.items()
+        ),
+    )
+
+
+def compile_action_plan(
+    options: dict,
+    data: dict,
+    start_service: str,
+    start_data: dict,
+    end_service: str,
+    end_data: dict,
+) -> ActionPlan:
+    """Build the ActionPlan for an entry's options/data and its resolved services."""
+    targets = tuple(dict.fromkeys(normalize_entity_ids(data.get(CONF_TARGET_ENTITY))))
+    return ActionPlan(
+        device_type=detect_device_type(options, data),
+        targets=targets,
+        target_set=frozenset(targets),
+        actions=MappingProxyType(action_snapshot(options, data)),
+        start=_compile_action(start_service, start_data, targets),
+        end=_compile_action(end_service, end_data, targets),
+        idempotent=bool(options.get(CONF_IDEMPOTENT, DEFAULT_IDEMPOTENT)),
+        verify=bool(options.get(CONF_VERIFY, DEFAULT_VERIFY)),
+    )
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Iterable, Optional
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    CATCH_UP_POLICIES,
+    CONF_CATCH_UP,
+    CONF_DEVICE_TYPE,
+    CONF_ENABLED,
+    CONF_END,
+    CONF_END_DATA,
+    CONF_END_OFFSET,
+    CONF_END_SERVICE,
+    CONF_END_TRIGGER,
+    CONF_IDEMPOTENT,
+    CONF_NAME,
+    CONF_RECONCILE,
+    CONF_SECOND_ENABLED,
+    CONF_SECOND_END,
+    CONF_SECOND_END_OFFSET,
+    CONF_SECOND_END_TRIGGER,
+    CONF_SECOND_START,
+    CONF_SECOND_START_OFFSET,
+    CONF_SECOND_START_TRIGGER,
+    CONF_START,
+    CONF_START_DATA,
+    CONF_START_OFFSET,
+    CONF_START_SERVICE,
+    CONF_START_TRIGGER,
+    CONF_TARGET_ENTITY,
+    CONF_VERIFY,
+    CONF_WEEKDAYS,
+    DEFAULT_END,
+    DEFAULT_END_DATA,
+    DEFAULT_END_SERVICE,
+    DEFAULT_SECOND_END,
+    DEFAULT_SECOND_START,
+    DEFAULT_START,
+    DEFAULT_START_DATA,
+    DEFAULT_START_SERVICE,
+    DEFAULT_WEEKDAYS,
+    DEVICE_TYPES,
+    DOMAIN,
+    TRIGGER_TYPES,
+    WEEKDAY_KEYS,
+)
+from .runtime_actions import detect_device_type
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_BULK_UPDATE = "bulk_update"
+
+CONF_ENTRY_IDS = "entry_ids"
+CONF_FILTER = "filter"
+CONF_OPTIONS = "options"
+
+# Every option ar_smart_scheduler/set_options and bulk_update accept. Shared
+# so a bulk patch is validated exactly like a single-entry edit.
+OPTION_PATCH_FIELDS = {
+    vol.Optional(CONF_START): str,
+    vol.Optional(CONF_END): str,
+    vol.Optional(CONF_START_TRIGGER): vol.In(TRIGGER_TYPES),
+    vol.Optional(CONF_END_TRIGGER): vol.In(TRIGGER_TYPES),
+    vol.Optional(CONF_START_OFFSET): int,
+    vol.Optional(CONF_END_OFFSET): int,
+    vol.Optional(CONF_WEEKDAYS): [vol.In(WEEKDAY_KEYS)],
+    vol.Optional(CONF_ENABLED): bool,
+    vol.Optional(CONF_SECOND_ENABLED): bool,
+    vol.Optional(CONF_SECOND_START): str,
+    vol.Optional(CONF_SECOND_END): str,
+    vol.Optional(CONF_SECOND_START_TRIGGER): vol.In(TRIGGER_TYPES),
+    vol.Optional(CONF_SECOND_END_TRIGGER): vol.In(TRIGGER_TYPES),
+    vol.Optional(CONF_SECOND_START_OFFSET): int,
+    vol.Optional(CONF_SECOND_END_OFFSET): int,
+    vol.Optional(CONF_CATCH_UP): vol.In(CATCH_UP_POLICIES),
+    vol.Optional(CONF_RECONCILE): bool,
+    vol.Optional(CONF_IDEMPOTENT): bool,
+    vol.Optional(CONF_VERIFY): bool,
+    # advanced internal (not required for your customer UI)
+    vol.Optional(CONF_START_SERVICE): str,
+    vol.Optional(CONF_END_SERVICE): str,
+    vol.Optional(CONF_START_DATA): dict,
+    vol.Optional(CONF_END_DATA): dict,
+}
+OPTION_PATCH_KEYS = tuple(str(key) for key in OPTION_PATCH_FIELDS)
+
+# An empty value for one of these means "back to the default".
+_PATCH_FALLBACKS: dict[str, Any] = {
+    CONF_START: DEFAULT_START,
+    CONF_END: DEFAULT_END,
+    CONF_WEEKDAYS: DEFAULT_WEEKDAYS,
+    CONF_SECOND_START: DEFAULT_SECOND_START,
+    CONF_SECOND_END: DEFAULT_SECOND_END,
+    CONF_START_SERVICE: DEFAULT_START_SERVICE,
+    CONF_END_SERVICE: DEFAULT_END_SERVICE,
+    CONF_START_DATA: DEFAULT_START_DATA,
+    CONF_END_DATA: DEFAULT_END_DATA,
+}
+
+# Selects entries by what they are rather than by id; every given key must
+# match. An empty filter selects every scheduler.
+FILTER_SCHEMA = vol.Schema(
+    {
+        # Case-insensitive substring of the scheduler name.
+        vol.Optional(CONF_NAME): str,
+        # Schedulers that control this entity.
+        vol.Optional("entity_id"): str,
+        vol.Optional(CONF_DEVICE_TYPE): vol.In(DEVICE_TYPES),
+        vol.Optional(CONF_ENABLED): bool,
+    }
+)
+
+BULK_UPDATE_FIELDS = {
+    vol.Exclusive(CONF_ENTRY_IDS, "selection"): vol.All(cv.ensure_list, [str]),
+    vol.Exclusive(CONF_FILTER, "selection"): FILTER_SCHEMA,
+    # Shared by the service and the websocket command, so both turn away
+    # an empty patch the same way.
+    vol.Required(CONF_OPTIONS): vol.All(
+        vol.Schema(OPTION_PATCH_FIELDS), vol.Length(min=1, msg="No options to change")
+    ),
+}
+
+
+def require_selection(value: dict[str, Any]) -> dict[str, Any]:
+    if CONF_ENTRY_IDS not in value and CONF_FILTER not in value:
+        raise vol.Invalid("Either entry_ids or filter is required")
+    return value
+
+
+BULK_UPDATE_SCHEMA = vol.All(vol.Schema(BULK_UPDATE_FIELDS), require_selection)
+
+
+def apply_option_patch(options: Optional[dict[str, Any]], patch: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of `options` with an (already validated) patch applied."""
+    opts = dict(options or {})
+    for key, value in patch.items():
+        if key in _PATCH_FALLBACKS and not value:
+            fallback = _PATCH_FALLBACKS[key]
+            value = fallback.copy() if isinstance(fallback, (dict, list)) else fallback
+        opts[key] = value
+    return opts
+
+
+def _matches(entry: ConfigEntry, criteria: dict[str, Any]) -> bool:
+    if CONF_NAME in criteria:
+        name = str(entry.data.get(CONF_NAME) or entry.title or "")
+        if criteria[CONF_NAME].casefold() not in name.casefold():
+            return False
+    if "entity_id" in criteria:
+        targets = entry.data.get(CONF_TARGET_ENTITY) or []
+        if isinstance(targets, str):
+            targets = [targets]
+        if criteria["entity_id"] not in targets:
+            return False
+    if CONF_DEVICE_TYPE in criteria:
+        # "auto" selects the entries left on auto-detection; any other type
+        # matches what the entry actually resolves to, auto or not.
+        if criteria[CONF_DEVICE_TYPE] == "auto":
+            if entry.options.get(CONF_DEVICE_TYPE, "auto") != "auto":
+                return False
+        elif detect_device_type(entry.options, entry.data) != criteria[CONF_DEVICE_TYPE]:
+            return False
+    if CONF_ENABLED in criteria:
+        if bool(entry.options.get(CONF_ENABLED, True)) != criteria[CONF_ENABLED]:
+            return False
+    return True
+
+
+async def _async_patch_entry(hass: HomeAssistant, entry: ConfigEntry, patch: dict[str, Any]) -> bool:
+    """Apply `patch` to one entry through its scheduler's mutation buffer.
+
+    Built on the options as they'll be once pending edits are written
+    (MutationBuffer.options), and submitted into that same buffer, so an
+    edit still waiting in the commit window neither gets lost nor later
+    overwrites the patch. Returns whether anything changed.
+    """
+    scheduler = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    current = scheduler.pending_options if scheduler is not None else dict(entry.options or {})
+    opts = apply_option_patch(current, patch)
+    if opts == current:
+        return False
+    if scheduler is None:
+        # Nothing running (e.g. its setup failed): nothing to batch with or reload.
+        hass.config_entries.async_update_entry(entry, options=opts)
+        return True
+    await scheduler.async_mutate(options=opts)
+    return True
+
+
+async def async_bulk_update(
+    hass: HomeAssistant,
+    patch: dict[str, Any],
+    entry_ids: Optional[Iterable[str]] = None,
+    criteria: Optional[dict[str, Any]] = None,
+) -> dict[str, dict[str, Any]]:
+    """Apply one option patch to many schedulers; return a result per entry_id.
+
+    The patch is validated once by the caller's schema and submitted to
+    every entry's mutation buffer at once, so all of them share one commit
+    window: each affected scheduler is written and reloaded once, together
+    with any edit of its own that was already pending, and entries whose
+    options already match the patch aren't written or reloaded at all.
+    HA delays and merges config-entry storage writes, so hundreds of
+    entries still end up as one write of core.config_entries.
+    """
+    if entry_ids is None:
+        entries = [
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if _matches(entry, criteria or {})
+        ]
+    else:
+        entries = []
+        for entry_id in dict.fromkeys(entry_ids):
+            entry = hass.config_entries.async_get_entry(entry_id)
+            entries.append(entry if entry is not None and entry.domain == DOMAIN else entry_id)
+
+    async def _async_update(entry: ConfigEntry | str) -> dict[str, Any]:
+        if isinstance(entry, str):
+            return {"ok": False, "error": "not_found"}
+        try:
+            changed = await _async_patch_entry(hass, entry, patch)
+        except Exception as err:  # noqa: BLE001 - report it, and carry on with the rest
+            _LOGGER.exception("Bulk update failed for entry %s", entry.entry_id)
+            return {"ok": False, "error": str(err)}
+        return {"ok": True, "changed": changed}
+
+    keys = [entry if isinstance(entry, str) else entry.entry_id for entry in entries]
+    results = dict(zip(keys, await asyncio.gather(*(_async_update(entry) for entry in entries))))
+
+    _LOGGER.debug(
+        "Bulk update: %d schedulers matched, %d changed",
+        len(results),
+        sum(1 for result in results.values() if result.get("changed")),
+    )
+    return results
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the ar_smart_scheduler.bulk_update service."""
+    if hass.services.has_service(DOMAIN, SERVICE_BULK_UPDATE):
+        return
+
+    async def _async_bulk_update(call: ServiceCall) -> ServiceResponse:
+        results = await async_bulk_update(
+            hass,
+            call.data[CONF_OPTIONS],
+            entry_ids=call.data.get(CONF_ENTRY_IDS),
+            criteria=call.data.get(CONF_FILTER),
+        )
+        return {"results": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_UPDATE,
+        _async_bulk_update,
+        schema=BULK_UPDATE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .dispatch import ServiceBatch
+
+_LOGGER = logging.getLogger(__name__)
+
+# Pause between the calls of the startup pass. Other integrations are still
+# settling right after EVENT_HOMEASSISTANT_STARTED, so the (merged) calls
+# are paced instead of landing on the radios all at once.
+STARTUP_CALL_INTERVAL = 0.5
+
+
+async def async_startup_pass(hass: HomeAssistant) -> None:
+    """Run once on EVENT_HOMEASSISTANT_STARTED: catch-up, then reconciliation.
+
+    Each scheduler first gets its policy (CONF_CATCH_UP) for fires that fell
+    into the downtime, spotted from the pending fires persisted by
+    store.py. One that did nothing there and has CONF_RECONCILE on then
+    re-sends the action for the window it's currently in
+    (ARScheduler.async_reconcile). Either way at most one action per
+    scheduler, all merged into one batch whose calls are started
+    STARTUP_CALL_INTERVAL apart (without waiting for each to finish).
+    """
+    now = dt_util.utcnow()
+    batch = ServiceBatch()
+    reconciled = 0
+    for entry_id, scheduler in list(hass.data.get(DOMAIN, {}).items()):
+        try:
+            if await scheduler.async_catch_up(now, batch):
+                continue
+            if await scheduler.async_reconcile(now, batch):
+                reconciled += 1
+        except Exception:  # noqa: BLE001 - one broken scheduler mustn't block the others
+            _LOGGER.exception("Startup pass failed for %s", entry_id)
+
+    if reconciled:
+        _LOGGER.info("Reconciling %d scheduler(s) with their current window (%d call(s))", reconciled, len(batch))
+    await batch.async_flush(hass, interval=STARTUP_CALL_INTERVAL)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_COMMAND_QUEUE
+
+if TYPE_CHECKING:
+    from .dispatch import BatchedCall
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long a command counts as in flight at most. The service call itself
+# carries on past this (a device that never answers); the target just stops
+# holding back whatever is queued behind it.
+CALL_TIMEOUT = 30
+
+
+class CommandQueue:
+    """Per-target ordering of every scheduler command, integration-wide.
+
+    Calls used to go out fire-and-forget, so two schedulers sharing a light,
+    or a short start2/end2 window whose end follows its start within
+    seconds, could pile commands up on a slow device - and have them
+    arrive in either order. Now each target has at most one command in
+    flight (a blocking call, so "done" means the integration handled it)
+    and at most one waiting behind it. A newer command for a busy target
+    replaces the waiting one rather than queueing after it: only the
+    latest intent is ever sent, and it's always sent last.
+
+    Targets that aren't busy go out together in the call they came in
+    with, so merged batch calls stay merged; only the follow-ups of busy
+    targets are sent per target.
+
+    "Latest" is issue order, not arrival order: a throttled lane can hold
+    a command back for seconds (see throttle.py), long enough for a later
+    batch's command for the same target to get here first. Every call is
+    ticketed in async_reserve as its batch is flushed, and a command that
+    arrives, or is about to start from the queue, when a newer ticket
+    exists for its target is dropped as superseded.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._in_flight: set[str] = set()
+        # Waiting command per busy target, with the monotonic time its
+        # batch started (for the delay reported through on_sent).
+        self._pending: dict[str, tuple[BatchedCall, float]] = {}
+        self._tickets = itertools.count(1)
+        # Newest ticket reserved per target.
+        self._latest: dict[str, int] = {}
+        # BatchedCall.key of the last command reserved for each target.
+        self._last_command: dict[str, tuple] = {}
+        self.superseded = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def last_command(self, entity_id: str) -> tuple | None:
+        """Key of the last command issued for `entity_id` (None if none yet).
+
+        A target's reported state lags behind whatever is still in flight
+        or waiting here - and, on a slow device, behind a call that already
+        returned - so the idempotent skip checks this before trusting it.
+        """
+        return self._last_command.get(entity_id)
+
+    @callback
+    def async_reserve(self, calls: list[BatchedCall]) -> None:
+        """Ticket a batch's calls for their targets, in issue order."""
+        for call in calls:
+            call.ticket = next(self._tickets)
+            for entity_id in call.targets:
+                self._latest[entity_id] = call.ticket
+                self._last_command[entity_id] = call.key
+
+    def _outdated(self, call: BatchedCall, entity_id: str) -> bool:
+        return self._latest.get(entity_id, 0) > call.ticket
+
+    def _drop(self, call: BatchedCall, entity_ids: list[str]) -> None:
+        self.superseded += len(entity_ids)
+        _LOGGER.debug("%s.%s for %s superseded by a newer command", call.domain, call.service, entity_ids)
+        for on_superseded in call.on_superseded:
+            on_superseded(entity_ids)
+
+    async def async_send(self, call: BatchedCall, entity_ids: list[str], started: float) -> None:
+        """Send `call` to the idle targets now; queue it for the busy ones."""
+        ready: list[str] = []
+        outdated: list[str] = []
+        for entity_id in entity_ids:
+            if self._outdated(call, entity_id):
+                outdated.append(entity_id)
+                continue
+            if entity_id not in self._in_flight:
+                ready.append(entity_id)
+                continue
+            previous = self._pending.get(entity_id)
+            if previous is not None and previous[0] is not call:
+                self._drop(previous[0], [entity_id])
+            self._pending[entity_id] = (call, started)
+
+        if outdated:
+            self._drop(call, outdated)
+        if ready:
+            self._in_flight.update(ready)
+            await self._async_run(call, ready, started)
+
+    async def _async_run(self, call: BatchedCall, entity_ids: list[str], started: float) -> None:
+        """Send to targets already marked in flight, then start what queued behind them."""
+        try:
+            await self._async_call(call, entity_ids, started)
+        finally:
+            self._in_flight.difference_update(entity_ids)
+            follow_ups: dict[int, tuple[BatchedCall, float, list[str]]] = {}
+            for entity_id in entity_ids:
+                queued = self._pending.pop(entity_id, None)
+                if queued is None:
+                    continue
+                follow_up = follow_ups.setdefault(id(queued[0]), (queued[0], queued[1], []))
+                follow_up[2].append(entity_id)
+            for next_call, next_started, next_ids in follow_ups.values():
+                # A newer command may have been reserved while this one
+                # waited (it's still held back by its lane); leave those
+                # targets free for it.
+                outdated = [entity_id for entity_id in next_ids if self._outdated(next_call, entity_id)]
+                if outdated:
+                    self._drop(next_call, outdated)
+                    next_ids = [entity_id for entity_id in next_ids if entity_id not in outdated]
+                    if not next_ids:
+                        continue
+                # Claimed right away, so nothing new can overtake them
+                # before their task gets going.
+                self._in_flight.update(next_ids)
+                self.hass.async_create_task(self._async_run(next_call, next_ids, next_started))
+
+    async def _async_call(self, call: BatchedCall, entity_ids: list[str], started: float) -> None:
+        payload = dict(call.data)
+        payload["entity_id"] = list(entity_ids)
+        delay = time.monotonic() - started
+        _LOGGER.debug(
+            "Sending %s.%s to %d entities after %.1fs", call.domain, call.service, len(entity_ids), delay
+        )
+        for on_sent in call.on_sent:
+            on_sent(payload["entity_id"], delay)
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(
+                    self.hass.services.async_call(call.domain, call.service, payload, blocking=True)
+                ),
+                CALL_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.warning(
+                "%s.%s for %s still running after %ss; sending what's queued behind it",
+                call.domain, call.service, payload["entity_id"], CALL_TIMEOUT,
+            )
+        except Exception as err:  # noqa: BLE001 - one bad call mustn't drop the rest of the batch
+            _LOGGER.exception("Scheduled call %s.%s failed for %s", call.domain, call.service, payload["entity_id"])
+            for on_error in call.on_error:
+                on_error(call.domain, call.service, payload["entity_id"], err)
+
+
+@callback
+def async_get_command_queue(hass: HomeAssistant) -> CommandQueue:
+    """Return the integration-wide CommandQueue, creating it on first use."""
+    queue: CommandQueue | None = hass.data.get(DATA_COMMAND_QUEUE)
+    if queue is None:
+        queue = hass.data[DATA_COMMAND_QUEUE] = CommandQueue(hass)
+    return queue
@@ -5,8 +5,10 @@ from homeassistant import config_entries
 from homeassistant.helpers import selector
 
 from .const import (
+    CATCH_UP_POLICIES,
     CLIMATE_ACTIONS,
     CLIMATE_ACTION_TO_SERVICE,
+    CONF_CATCH_UP,
     CONF_CLIMATE_END_ACTION,
     CONF_CLIMATE_END_TEMPERATURE,
     CONF_CLIMATE_START_ACTION,
@@ -22,6 +24,8 @@ from .const import (
     CONF_END_OFFSET,
     CONF_END_SERVICE,
     CONF_END_TRIGGER,
+    CONF_IDEMPOTENT,
+    CONF_LEAN,
     CONF_LIGHT_END_ACTION,
     CONF_LIGHT_END_BRIGHTNESS,
     CONF_LIGHT_START_ACTION,
@@ -31,6 +35,7 @@ from .const import (
     CONF_NAME,
     CONF_ONOFF_END_ACTION,
     CONF_ONOFF_START_ACTION,
+    CONF_RECONCILE,
     CONF_SECOND_ENABLED,
     CONF_SECOND_END,
     CONF_SECOND_END_OFFSET,
@@ -44,6 +49,7 @@ from .const import (
     CONF_START_SERVICE,
     CONF_START_TRIGGER,
     CONF_TARGET_ENTITY,
+    CONF_VERIFY,
     CONF_WATER_HEATER_END_ACTION,
     CONF_WATER_HEATER_END_TEMPERATURE,
     CONF_WATER_HEATER_START_ACTION,
@@ -51,6 +57,7 @@ from .const import (
     CONF_WEEKDAYS,
     COVER_ACTIONS,
     COVER_ACTION_TO_SERVICE,
+    DEFAULT_CATCH_UP,
     DEFAULT_CLIMATE_END_ACTION,
     DEFAULT_CLIMATE_END_TEMPERATURE,
     DEFAULT_CLIMATE_START_ACTION,
@@ -62,6 +69,8 @@ from .const import (
     DEFAULT_END,
     DEFAULT_END_OFFSET,
     DEFAULT_END_TRIGGER,
+    DEFAULT_IDEMPOTENT,
+    DEFAULT_LEAN,
     DEFAULT_LIGHT_END_ACTION,
     DEFAULT_LIGHT_END_BRIGHTNESS,
     DEFAULT_LIGHT_START_ACTION,
@@ -70,6 +79,7 @@ from .const import (
     DEFAULT_LOCK_START_ACTION,
     DEFAULT_ONOFF_END_ACTION,
     DEFAULT_ONOFF_START_ACTION,
+    DEFAULT_RECONCILE,
     DEFAULT_SECOND_ENABLED,
     DEFAULT_SECOND_END,
     DEFAULT_SECOND_END_OFFSET,
@@ -80,6 +90,7 @@ from .const import (
     DEFAULT_START,
     DEFAULT_START_OFFSET,
     DEFAULT_START_TRIGGER,
+    DEFAULT_VERIFY,
     DEFAULT_WATER_HEATER_END_ACTION,
     DEFAULT_WATER_HEATER_END_TEMPERATURE,
     DEFAULT_WATER_HEATER_START_ACTION,
@@ -505,6 +516,13 @@ def _general_schema(data: dict, opts: dict) -> vol.Schema:
                 selector.SelectSelectorConfig(options=DEVICE_TYPES)
             ),
             vol.Required(CONF_ENABLED, default=bool(opts.get(CONF_ENABLED, True))): bool,
+            vol.Required(CONF_LEAN, default=bool(opts.get(CONF_LEAN, DEFAULT_LEAN))): bool,
+            vol.Required(CONF_CATCH_UP, default=opts.get(CONF_CATCH_UP, DEFAULT_CATCH_UP)): selector.SelectSelector(
+                selector.SelectSelectorConfig(options=CATCH_UP_POLICIES)
+            ),
+            vol.Required(CONF_RECONCILE, default=bool(opts.get(CONF_RECONCILE, DEFAULT_RECONCILE))): bool,
+            vol.Required(CONF_IDEMPOTENT, default=bool(opts.get(CONF_IDEMPOTENT, DEFAULT_IDEMPOTENT))): bool,
+            vol.Required(CONF_VERIFY, default=bool(opts.get(CONF_VERIFY, DEFAULT_VERIFY))): bool,
         }
     )
 
@@ -621,6 +639,11 @@ def _prepare_general(user_input: dict) -> tuple[str, list[str], str, dict]:
     general_options = {
         CONF_DEVICE_TYPE: requested_type,
         CONF_ENABLED: bool(user_input.get(CONF_ENABLED, True)),
+        CONF_LEAN: bool(user_input.get(CONF_LEAN, DEFAULT_LEAN)),
+        CONF_CATCH_UP: user_input.get(CONF_CATCH_UP, DEFAULT_CATCH_UP),
+        CONF_RECONCILE: bool(user_input.get(CONF_RECONCILE, DEFAULT_RECONCILE)),
+        CONF_IDEMPOTENT: bool(user_input.get(CONF_IDEMPOTENT, DEFAULT_IDEMPOTENT)),
+        CONF_VERIFY: bool(user_input.get(CONF_VERIFY, DEFAULT_VERIFY)),
     }
     return name, entity_ids, device_type, general_options
 
@@ -3,6 +3,18 @@ SUN_ENTITY_ID = "sun.sun"
 
 # Required by __init__.py
 PLATFORMS = ["switch", "time", "sensor", "number", "select"]
+# Lean mode (CONF_LEAN): just the sensors and the enabled switch - the
+# card/websocket API is the configuration surface.
+LEAN_PLATFORMS = ["switch", "sensor"]
+
+# hass.data keys for integration-wide singletons (siblings of
+# hass.data[DOMAIN], which maps entry_id -> ARScheduler)
+DATA_TIMER_HEAP = f"{DOMAIN}_timer_heap"
+DATA_EPHEMERIS = f"{DOMAIN}_ephemeris"
+DATA_REVISIONS = f"{DOMAIN}_revisions"
+DATA_RUNTIME_STORE = f"{DOMAIN}_runtime_store"
+DATA_THROTTLE = f"{DOMAIN}_throttle"
+DATA_COMMAND_QUEUE = f"{DOMAIN}_command_queue"
 
 # Frontend card (served by the integration itself)
 FRONTEND_URL_BASE = "/ar_smart_scheduler_files"
@@ -42,6 +54,11 @@ CONF_WEEKDAYS = "weekdays"
 CONF_START = "start_time"
 CONF_END = "end_time"
 CONF_ENABLED = "enabled"
+CONF_LEAN = "lean"
+CONF_CATCH_UP = "catch_up"
+CONF_RECONCILE = "reconcile_on_start"
+CONF_IDEMPOTENT = "idempotent_dispatch"
+CONF_VERIFY = "verify_dispatch"
 CONF_START_TRIGGER = "start_trigger"
 CONF_END_TRIGGER = "end_trigger"
 CONF_START_OFFSET = "start_offset"
@@ -62,7 +79,20 @@ CONF_END_SERVICE = "end_service"
 CONF_START_DATA = "start_data"
 CONF_END_DATA = "end_data"
 
+# What to do about fires missed while HA was down (catchup.py):
+# nothing, re-run the most recent missed one, or apply whatever the
+# schedule says should be in effect right now.
+CATCH_UP_SKIP = "skip"
+CATCH_UP_RUN_LATEST = "run_latest"
+CATCH_UP_APPLY_WINDOW = "apply_window_state"
+CATCH_UP_POLICIES = [CATCH_UP_SKIP, CATCH_UP_RUN_LATEST, CATCH_UP_APPLY_WINDOW]
+
 # Defaults
+DEFAULT_LEAN = False
+DEFAULT_CATCH_UP = CATCH_UP_SKIP
+DEFAULT_RECONCILE = False
+DEFAULT_IDEMPOTENT = False
+DEFAULT_VERIFY = False
 DEFAULT_WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
 DEFAULT_START = "06:00:00"
 DEFAULT_END = "18:00:00"
@@ -228,8 +258,18 @@ DEFAULT_LOCK_END_ACTION = "lock"
 # Dispatcher signals
 # -------------------------------------------------
 
+# Which signal an entity listens on decides which changes wake it up:
+# SIGNAL_UPDATED - enabled/weekdays (the switches); SIGNAL_*_UPDATED - one
+# track's trigger/time/offset plus (start/end) the action profile;
+# SIGNAL_INFO_UPDATED - anything at all, including fires and next/last run
+# times (the info sensor, which shows all of it).
 SIGNAL_UPDATED = "ar_smart_scheduler_updated"
+SIGNAL_INFO_UPDATED = "ar_smart_scheduler_info_updated"
 SIGNAL_START_UPDATED = "ar_smart_scheduler_start_updated"
 SIGNAL_END_UPDATED = "ar_smart_scheduler_end_updated"
 SIGNAL_START2_UPDATED = "ar_smart_scheduler_start2_updated"
 SIGNAL_END2_UPDATED = "ar_smart_scheduler_end2_updated"
+
+# Not per-entry: sent with the entry_id whenever any scheduler's snapshot
+# changes (or it's removed), for ar_smart_scheduler/subscribe.
+SIGNAL_SCHEDULER_CHANGED = "ar_smart_scheduler_scheduler_changed"
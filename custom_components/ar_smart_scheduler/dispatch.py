@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from .command_queue import async_get_command_queue
+from .throttle import async_get_dispatch_throttle
+
+if TYPE_CHECKING:
+    from .action_plan import PlannedCall
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def freeze(value: Any) -> Any:
+    """Hashable, order-independent form of a service_data value."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+# Called with (domain, service, entity_ids, error) when a call a scheduler
+# contributed to fails.
+FailureCallback = Callable[[str, str, list[str], BaseException], None]
+# Called with (entity_ids, seconds) as a call goes out - see throttle.py.
+SentCallback = Callable[[list[str], float], None]
+# Called with the entity_ids a call will no longer be sent to, because a
+# newer command for them came in while it waited - see command_queue.py.
+SupersededCallback = Callable[[list[str]], None]
+
+
+@dataclass
+class BatchedCall:
+    """One merged service call and the schedulers that contributed to it."""
+
+    domain: str
+    service: str
+    data: Mapping[str, Any]
+    # The PlannedCall merge key, which CommandQueue also keeps as each
+    # target's last command (see CommandQueue.last_command).
+    key: tuple
+    # dict-as-ordered-set: targets unioned, first-seen order kept.
+    targets: dict[str, None] = field(default_factory=dict)
+    on_error: list[FailureCallback] = field(default_factory=list)
+    on_sent: list[SentCallback] = field(default_factory=list)
+    on_superseded: list[SupersededCallback] = field(default_factory=list)
+    # Issue order, stamped by CommandQueue.async_reserve when the batch is
+    # flushed (0 = never reserved).
+    ticket: int = 0
+
+    @property
+    def entity_ids(self) -> list[str]:
+        return list(self.targets)
+
+
+class ServiceBatch:
+    """Service calls from every fire due in the same timer-heap wake-up.
+
+    At 18:00:00 or at sunset dozens of schedulers fire together, and most of
+    them ask for the exact same call (40 light schedulers all doing
+    light.turn_off with no data). Rather than each scheduler issuing its own
+    hass.services.async_call per domain, fires add their calls here and the
+    heap flushes the batch once: one call per (domain, service, service_data)
+    with the entity_id lists unioned - one command to a slow Zigbee/Z-Wave
+    coordinator instead of forty.
+
+    The merged calls go out concurrently (paced per integration, if
+    configured - see throttle.py), each isolated from the others: a failing
+    call is logged and reported to the on_error callback of every scheduler
+    that contributed to it, and the rest still run.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[tuple, BatchedCall] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def add_planned(
+        self,
+        planned: PlannedCall,
+        on_error: FailureCallback | None = None,
+        on_sent: SentCallback | None = None,
+        on_superseded: SupersededCallback | None = None,
+    ) -> None:
+        """Merge in one call from a compiled ActionPlan - no copying, no re-keying."""
+        call = self._calls.get(planned.key)
+        if call is None:
+            call = self._calls[planned.key] = BatchedCall(
+                planned.domain, planned.service, planned.data, planned.key
+            )
+        call.targets.update(dict.fromkeys(planned.entity_ids))
+        if on_error is not None and on_error not in call.on_error:
+            call.on_error.append(on_error)
+        if on_sent is not None and on_sent not in call.on_sent:
+            call.on_sent.append(on_sent)
+        if on_superseded is not None and on_superseded not in call.on_superseded:
+            call.on_superseded.append(on_superseded)
+
+    async def async_flush(self, hass: HomeAssistant, interval: float = 0) -> None:
+        """Send every collected call; each started `interval` seconds after the last, if given.
+
+        Calls are blocking (see command_queue.py), so a paced flush starts
+        each one on schedule and only waits for them all at the end - an
+        unresponsive device holds up its own call, not the ones after it.
+        """
+        calls, self._calls = list(self._calls.values()), {}
+        # Order is settled here, before any pacing: whatever a target is sent
+        # later, only the latest flushed command for it wins.
+        async_get_command_queue(hass).async_reserve(calls)
+        throttle = async_get_dispatch_throttle(hass)
+        if not interval:
+            await throttle.async_send(calls)
+            return
+        sends: list[asyncio.Task] = []
+        for index, call in enumerate(calls):
+            if index:
+                await asyncio.sleep(interval)
+            sends.append(hass.async_create_task(throttle.async_send([call])))
+        await asyncio.gather(*sends)
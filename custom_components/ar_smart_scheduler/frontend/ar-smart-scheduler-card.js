@@ -175,7 +175,13 @@ class ARSmartSchedulerCard extends HTMLElement {
     this._hass = null;
     this._loaded = false;
     this._busy = false;
-    this._pollTimer = null;
+    // Unsubscribe function for ar_smart_scheduler/subscribe (see
+    // _subscribe), null while not subscribed.
+    this._unsubPush = null;
+    this._subscribing = false;
+    // Delta cursor from the last listing or push event (see
+    // _applyListing). Null until the first full list arrives.
+    this._cursor = null;
 
     this._addOpen = false;
     this._addBusy = false;
@@ -199,7 +205,7 @@ class ARSmartSchedulerCard extends HTMLElement {
   set hass(hass) {
     const first = !this._hass;
     this._hass = hass;
-    if (first) this._refresh();
+    if (first && this.isConnected) this._subscribe();
   }
 
   getCardSize() {
@@ -207,8 +213,7 @@ class ARSmartSchedulerCard extends HTMLElement {
   }
 
   connectedCallback() {
-    if (this._hass && !this._loaded) this._refresh();
-    this._pollTimer = setInterval(() => this._refresh(true), 30000);
+    this._subscribe();
 
     // Closes an open entity-picker dropdown when the user taps/clicks
     // anywhere outside it (including outside the card entirely) - the
@@ -236,8 +241,7 @@ class ARSmartSchedulerCard extends HTMLElement {
   }
 
   disconnectedCallback() {
-    if (this._pollTimer) clearInterval(this._pollTimer);
-    this._pollTimer = null;
+    this._unsubscribe();
     if (this._outsideClickHandler) {
       document.removeEventListener("click", this._outsideClickHandler, true);
       this._outsideClickHandler = null;
@@ -283,26 +287,90 @@ class ARSmartSchedulerCard extends HTMLElement {
     });
   }
 
+  // Live updates instead of polling: the backend pushes one full listing,
+  // then a patch whenever a scheduler fires, is edited, or its solar time
+  // moves. hass.connection re-subscribes by itself after a reconnect (and
+  // gets a fresh full listing back), so nothing here has to retry.
+  async _subscribe() {
+    if (!this._hass || this._unsubPush || this._subscribing) return;
+    this._subscribing = true;
+    try {
+      const unsub = await this._hass.connection.subscribeMessage(
+        (event) => this._applyListing(event, true),
+        { type: "ar_smart_scheduler/subscribe" }
+      );
+      this._unsubPush = unsub;
+      // Removed from the page while the subscription was being set up.
+      if (!this.isConnected) this._unsubscribe();
+    } catch (err) {
+      // Couldn't subscribe - fall back to a one-off list, which also
+      // surfaces the error in the card if the backend is unreachable.
+      this._refresh();
+    } finally {
+      this._subscribing = false;
+    }
+  }
+
+  _unsubscribe() {
+    const unsub = this._unsubPush;
+    this._unsubPush = null;
+    if (unsub) Promise.resolve(unsub()).catch(() => {});
+  }
+
+  // Applies a list reply or a push event. A "full" one (first load, HA
+  // restarted, cursor too old) replaces the list outright; otherwise only
+  // the changed schedulers are merged in and removed ones dropped.
+  _applyListing(resp, silent) {
+    if (resp && resp.epoch) {
+      const cursor = this._cursor;
+      if (!cursor || cursor.epoch !== resp.epoch || resp.revision > cursor.revision) {
+        this._cursor = { epoch: resp.epoch, revision: resp.revision };
+      }
+    }
+    if (resp && resp.unchanged) {
+      this._loaded = true;
+      return;
+    }
+
+    let items = (resp && resp.schedulers) || [];
+    if (resp && !resp.full && resp.epoch) {
+      const byId = new Map(this._schedulers.map((s) => [s.entry_id, s]));
+      (resp.removed || []).forEach((entryId) => byId.delete(entryId));
+      items.forEach((s) => byId.set(s.entry_id, s));
+      items = Array.from(byId.values());
+    } else {
+      this._domains = (resp && resp.domains) || FALLBACK_DOMAINS;
+      this._deviceTypes = (resp && resp.device_types) || FALLBACK_DEVICE_TYPES;
+    }
+    if (this._config.entry_id) {
+      items = items.filter((s) => s.entry_id === this._config.entry_id);
+    }
+    items.sort((a, b) => String(a.name).localeCompare(String(b.name)));
+    this._schedulers = items;
+    this._loaded = true;
+    // Don't clobber the user's cursor/focus with a background re-render
+    // while they're mid-edit in a text field.
+    if (!(silent && this._isEditingText())) this._render();
+  }
+
+  // One-off list call, used right after the card's own edits and as the
+  // fallback when subscribing fails. Sends the cursor so the backend only
+  // returns schedulers that changed (or were deleted) since then - or
+  // just {unchanged: true}.
   async _refresh(silent) {
     if (!this._hass || this._busy) return;
     this._busy = true;
     try {
-      const resp = await this._callWS({ type: "ar_smart_scheduler/list" });
-      let items = (resp && resp.schedulers) || [];
-      if (this._config.entry_id) {
-        items = items.filter((s) => s.entry_id === this._config.entry_id);
+      const msg = { type: "ar_smart_scheduler/list" };
+      if (this._cursor) {
+        msg.epoch = this._cursor.epoch;
+        msg.since = this._cursor.revision;
       }
-      items.sort((a, b) => String(a.name).localeCompare(String(b.name)));
-      this._schedulers = items;
-      this._domains = (resp && resp.domains) || FALLBACK_DOMAINS;
-      this._deviceTypes = (resp && resp.device_types) || FALLBACK_DEVICE_TYPES;
-      this._loaded = true;
-      // Don't clobber the user's cursor/focus with a poll-driven re-render
-      // while they're mid-edit in a text field.
-      if (!(silent && this._isEditingText())) this._render();
+      this._applyListing(await this._callWS(msg), silent);
     } catch (err) {
       if (!silent) {
         this._schedulers = [];
+        this._cursor = null;
         this._loaded = true;
         this._render(String(err && err.message ? err.message : err));
       }
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long a change waits for others to join it before being written.
+# Short enough that a single tap still feels immediate.
+COMMIT_WINDOW = 0.3
+
+
+class MutationBuffer:
+    """Collects one entry's option/data/title changes into one write per window.
+
+    Every edit used to be its own async_update_entry plus a full reload:
+    dragging a card slider, or tapping four weekday switches in a row, was
+    a chain of entry writes, update-listener reloads and timer rebuilds.
+    Edits are now merged here (later values win per key) and committed
+    together COMMIT_WINDOW seconds after the first one - one
+    async_update_entry and one reload - and every caller's
+    async_submit() returns once that commit (or its failure) is done.
+
+    Callers that derive a change from the current value (toggle one
+    weekday, patch one action field) must read `options`/`data` here, not
+    entry.options, or a second edit inside the window would be built on
+    top of a value that's about to be overwritten.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        on_commit: Callable[[], Awaitable[None]],
+    ) -> None:
+        self.hass = hass
+        self.entry = entry
+        self._on_commit = on_commit
+        self._options: dict[str, Any] = {}
+        self._data: dict[str, Any] = {}
+        self._title: Optional[str] = None
+        self._waiters: list[asyncio.Future] = []
+        self._unsub_commit: Optional[CALLBACK_TYPE] = None
+
+    @property
+    def options(self) -> dict[str, Any]:
+        """Entry options as they'll be once pending changes are written."""
+        return {**self.entry.options, **self._options}
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """Entry data as it'll be once pending changes are written."""
+        return {**self.entry.data, **self._data}
+
+    async def async_submit(
+        self,
+        *,
+        options: Optional[dict[str, Any]] = None,
+        data: Optional[dict[str, Any]] = None,
+        title: Optional[str] = None,
+    ) -> None:
+        """Queue changes and wait until they've been written and reloaded."""
+        if options:
+            self._options.update(options)
+        if data:
+            self._data.update(data)
+        if title is not None:
+            self._title = title
+
+        waiter = self.hass.loop.create_future()
+        self._waiters.append(waiter)
+        if self._unsub_commit is None:
+            self._unsub_commit = async_call_later(self.hass, COMMIT_WINDOW, self._async_commit)
+        await waiter
+
+    def _take(self) -> tuple[dict[str, Any], list[asyncio.Future]]:
+        changes: dict[str, Any] = {}
+        if self._options:
+            changes["options"] = self.options
+        if self._data:
+            changes["data"] = self.data
+        if self._title is not None:
+            changes["title"] = self._title
+        waiters = self._waiters
+        self._options, self._data, self._title, self._waiters = {}, {}, None, []
+        return changes, waiters
+
+    async def _async_commit(self, _now: Optional[dt.datetime] = None) -> None:
+        self._unsub_commit = None
+        changes, waiters = self._take()
+        _LOGGER.debug(
+            "Committing %d batched change(s) for %s: %s", len(waiters), self.entry.entry_id, sorted(changes)
+        )
+        try:
+            if changes:
+                self.hass.config_entries.async_update_entry(self.entry, **changes)
+            await self._on_commit()
+        except Exception as err:  # noqa: BLE001 - handed to every caller waiting on this window
+            _resolve(waiters, err)
+            return
+        _resolve(waiters)
+
+    @callback
+    def async_flush(self) -> None:
+        """Write whatever is pending right away, without the reload.
+
+        Used when the scheduler is stopping, so a change made just before
+        an unload isn't lost with the buffer.
+        """
+        if self._unsub_commit is not None:
+            self._unsub_commit()
+            self._unsub_commit = None
+        changes, waiters = self._take()
+        try:
+            if changes:
+                self.hass.config_entries.async_update_entry(self.entry, **changes)
+        except Exception as err:  # noqa: BLE001 - handed to the waiting callers
+            _resolve(waiters, err)
+            return
+        _resolve(waiters)
+
+
+def _resolve(waiters: list[asyncio.Future], err: Optional[BaseException] = None) -> None:
+    for waiter in waiters:
+        if waiter.done():
+            continue
+        if err is None:
+            waiter.set_result(None)
+        else:
+            waiter.set_exception(err)
@@ -19,23 +19,35 @@ from .const import (
     SIGNAL_START2_UPDATED,
     SIGNAL_START_UPDATED,
 )
-from .runtime_actions import build_runtime_action_updates, detect_device_type
+from .registry import async_prune_entities
+from .runtime_actions import build_runtime_action_updates
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     scheduler = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities(
-        [
-            SchedulerOffsetNumber(entry, scheduler, "Start Offset", f"{DOMAIN}_{entry.entry_id}_start_offset", CONF_START_OFFSET, SIGNAL_START_UPDATED),
-            SchedulerOffsetNumber(entry, scheduler, "End Offset", f"{DOMAIN}_{entry.entry_id}_end_offset", CONF_END_OFFSET, SIGNAL_END_UPDATED),
-            SchedulerOffsetNumber(entry, scheduler, "Second Start Offset", f"{DOMAIN}_{entry.entry_id}_second_start_offset", CONF_SECOND_START_OFFSET, SIGNAL_START2_UPDATED, second=True),
-            SchedulerOffsetNumber(entry, scheduler, "Second End Offset", f"{DOMAIN}_{entry.entry_id}_second_end_offset", CONF_SECOND_END_OFFSET, SIGNAL_END2_UPDATED, second=True),
-            SchedulerActionNumber(entry, scheduler, "Start HVAC Temperature", f"{DOMAIN}_{entry.entry_id}_climate_start_temperature", CONF_CLIMATE_START_TEMPERATURE, 8, 35, SIGNAL_START_UPDATED, ("climate",)),
-            SchedulerActionNumber(entry, scheduler, "End HVAC Temperature", f"{DOMAIN}_{entry.entry_id}_climate_end_temperature", CONF_CLIMATE_END_TEMPERATURE, 8, 35, SIGNAL_END_UPDATED, ("climate",)),
-            SchedulerActionNumber(entry, scheduler, "Start Water Heater Temperature", f"{DOMAIN}_{entry.entry_id}_water_heater_start_temperature", CONF_WATER_HEATER_START_TEMPERATURE, 30, 80, SIGNAL_START_UPDATED, ("water_heater",)),
-            SchedulerActionNumber(entry, scheduler, "End Water Heater Temperature", f"{DOMAIN}_{entry.entry_id}_water_heater_end_temperature", CONF_WATER_HEATER_END_TEMPERATURE, 30, 80, SIGNAL_END_UPDATED, ("water_heater",)),
-        ]
-    )
+    entities = [
+        SchedulerOffsetNumber(entry, scheduler, "Start Offset", f"{DOMAIN}_{entry.entry_id}_start_offset", CONF_START_OFFSET, SIGNAL_START_UPDATED),
+        SchedulerOffsetNumber(entry, scheduler, "End Offset", f"{DOMAIN}_{entry.entry_id}_end_offset", CONF_END_OFFSET, SIGNAL_END_UPDATED),
+        SchedulerOffsetNumber(entry, scheduler, "Second Start Offset", f"{DOMAIN}_{entry.entry_id}_second_start_offset", CONF_SECOND_START_OFFSET, SIGNAL_START2_UPDATED, second=True),
+        SchedulerOffsetNumber(entry, scheduler, "Second End Offset", f"{DOMAIN}_{entry.entry_id}_second_end_offset", CONF_SECOND_END_OFFSET, SIGNAL_END2_UPDATED, second=True),
+        SchedulerActionNumber(entry, scheduler, "Start HVAC Temperature", f"{DOMAIN}_{entry.entry_id}_climate_start_temperature", CONF_CLIMATE_START_TEMPERATURE, 8, 35, SIGNAL_START_UPDATED, ("climate",)),
+        SchedulerActionNumber(entry, scheduler, "End HVAC Temperature", f"{DOMAIN}_{entry.entry_id}_climate_end_temperature", CONF_CLIMATE_END_TEMPERATURE, 8, 35, SIGNAL_END_UPDATED, ("climate",)),
+        SchedulerActionNumber(entry, scheduler, "Start Water Heater Temperature", f"{DOMAIN}_{entry.entry_id}_water_heater_start_temperature", CONF_WATER_HEATER_START_TEMPERATURE, 30, 80, SIGNAL_START_UPDATED, ("water_heater",)),
+        SchedulerActionNumber(entry, scheduler, "End Water Heater Temperature", f"{DOMAIN}_{entry.entry_id}_water_heater_end_temperature", CONF_WATER_HEATER_END_TEMPERATURE, 30, 80, SIGNAL_END_UPDATED, ("water_heater",)),
+    ]
+    # Only the action controls for this scheduler's resolved device type -
+    # the others could never be anything but unavailable. A device type
+    # change reloads the entry (see _async_update_entry), and the pruning
+    # below drops the previous type's controls from the registry.
+    device_type = scheduler.entity_device_type
+    entities = [
+        entity
+        for entity in entities
+        if not isinstance(entity, SchedulerActionNumber) or device_type in entity._device_types
+    ]
+    created = {entity.unique_id for entity in entities}
+    async_prune_entities(hass, entry, lambda reg_entry: reg_entry.domain != "number" or reg_entry.unique_id in created)
+    async_add_entities(entities)
 
 
 class SchedulerOffsetNumber(NumberEntity):
@@ -114,14 +126,16 @@ class SchedulerActionNumber(NumberEntity):
 
     @property
     def available(self):
-        return detect_device_type(self.entry.options, self.entry.data) in self._device_types
+        return self.scheduler.plan.device_type in self._device_types
 
     @property
     def native_value(self):
         return float(self.entry.options.get(self._option_key, self._attr_native_min_value))
 
     async def async_set_native_value(self, value: float):
-        updates = dict(self.entry.options or {})
+        # Built on the pending options so a second edit inside the
+        # mutation buffer's window doesn't undo the first.
+        updates = dict(self.scheduler.pending_options)
         updates[self._option_key] = int(value)
-        updates.update(build_runtime_action_updates(updates, self.entry.data))
+        updates.update(build_runtime_action_updates(updates, self.scheduler.pending_data))
         await self.scheduler.async_update_options(updates)
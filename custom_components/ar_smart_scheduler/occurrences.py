@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import datetime as dt
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from homeassistant.util import dt as dt_util
+
+
+def weekday_mask(weekdays: Iterable[int]) -> int:
+    """Bitmask with bit N set for every allowed weekday N (Mon=0 .. Sun=6)."""
+    mask = 0
+    for day in weekdays:
+        mask |= 1 << day
+    return mask
+
+
+def _build_day_table(direction: int) -> tuple[tuple[Optional[int], ...], ...]:
+    # table[mask][weekday] = days from `weekday` to the nearest allowed
+    # weekday in `direction` (0 if `weekday` itself is allowed), or None for
+    # an empty mask.
+    table = []
+    for mask in range(128):
+        row = []
+        for weekday in range(7):
+            row.append(
+                next(
+                    (delta for delta in range(7) if mask & (1 << ((weekday + direction * delta) % 7))),
+                    None,
+                )
+            )
+        table.append(tuple(row))
+    return tuple(table)
+
+
+_DAYS_AHEAD = _build_day_table(1)
+_DAYS_BEHIND = _build_day_table(-1)
+
+
+def mask_allows(mask: int, day: dt.date) -> bool:
+    return bool(mask & (1 << day.weekday()))
+
+
+@dataclass(frozen=True)
+class OccurrenceCalendar:
+    """A fixed local time on a set of weekdays, compiled for O(1) lookups.
+
+    next_after() is two table lookups and at most two datetime constructions
+    - no day-by-day loop - so a Mon-Fri track is armed straight for Monday
+    on a Friday evening rather than waking on Saturday and Sunday only to be
+    thrown away.
+
+    DST: local times are resolved with the configured time zone for the
+    date they fall on, so the UTC instant shifts with the clocks. A time
+    that doesn't exist on a spring-forward day (e.g. 02:30) fires at the
+    equivalent post-transition wall time (03:30); a time that occurs twice
+    on a fall-back day fires on its first occurrence.
+    """
+
+    mask: int
+    at: dt.time
+
+    def instant_on(self, day: dt.date, tz: dt.tzinfo) -> dt.datetime:
+        """UTC instant of this calendar's local time on `day`."""
+        return dt_util.as_utc(dt.datetime.combine(day, self.at, tzinfo=tz))
+
+    def next_after(self, now: Optional[dt.datetime] = None) -> Optional[dt.datetime]:
+        """First occurrence strictly after `now`, in UTC (None if no weekdays)."""
+        now = dt_util.as_local(now or dt_util.utcnow())
+        row = _DAYS_AHEAD[self.mask]
+        weekday = now.weekday()
+        days = row[weekday]
+        if days is None:
+            return None
+
+        if days == 0:
+            today = self.instant_on(now.date(), now.tzinfo)
+            if today > now:
+                return today
+            days = 1 + row[(weekday + 1) % 7]
+
+        return self.instant_on(now.date() + dt.timedelta(days=days), now.tzinfo)
+
+    def last_at_or_before(self, now: Optional[dt.datetime] = None) -> Optional[dt.datetime]:
+        """Latest occurrence at or before `now`, in UTC (None if no weekdays)."""
+        now = dt_util.as_local(now or dt_util.utcnow())
+        row = _DAYS_BEHIND[self.mask]
+        weekday = now.weekday()
+        days = row[weekday]
+        if days is None:
+            return None
+
+        if days == 0:
+            today = self.instant_on(now.date(), now.tzinfo)
+            if today <= now:
+                return today
+            days = 1 + row[(weekday - 1) % 7]
+
+        return self.instant_on(now.date() - dt.timedelta(days=days), now.tzinfo)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_prune_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    keep: Callable[[er.RegistryEntry], bool],
+) -> None:
+    """Drop this entry's registered entities that it no longer creates.
+
+    An entity that simply stops being added stays in the registry (and the
+    UI) as "unavailable - no longer provided" forever, so whenever an entry
+    is set up with fewer entities than before (lean mode, a narrower device
+    type) the leftovers are removed here.
+    """
+    registry = er.async_get(hass)
+    for reg_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if not keep(reg_entry):
+            _LOGGER.debug("Removing %s, no longer created for %s", reg_entry.entity_id, entry.entry_id)
+            registry.async_remove(reg_entry.entity_id)
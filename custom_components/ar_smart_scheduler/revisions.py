@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import uuid
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_REVISIONS
+
+# Deleted-scheduler tombstones kept for delta clients. Once older ones are
+# dropped, a client whose cursor predates them just gets a full resync.
+MAX_TOMBSTONES = 1000
+
+
+class RevisionLog:
+    """Integration-wide revision counter behind ar_smart_scheduler/list deltas.
+
+    Every ARScheduler stamps itself with the next global revision whenever
+    its snapshot changes, so "what changed since cursor N" is just every
+    scheduler with revision > N, plus the tombstones of schedulers deleted
+    after N. The counter lives in memory only; `epoch` changes on every HA
+    start, which is how a client holding a cursor from a previous run
+    knows to fall back to a full list.
+    """
+
+    def __init__(self) -> None:
+        self.epoch = uuid.uuid4().hex
+        self.revision = 0
+        self._removed: dict[str, int] = {}
+        # Cursors older than this may have missed a pruned tombstone.
+        self._horizon = 0
+
+    def next_revision(self) -> int:
+        self.revision += 1
+        return self.revision
+
+    def record_removed(self, entry_id: str) -> None:
+        self._removed[entry_id] = self.next_revision()
+        if len(self._removed) > MAX_TOMBSTONES:
+            oldest = min(self._removed, key=self._removed.__getitem__)
+            self._horizon = self._removed.pop(oldest)
+
+    def forget_removed(self, entry_id: str) -> None:
+        """A scheduler came back (entry reloaded) - it isn't deleted any more."""
+        self._removed.pop(entry_id, None)
+
+    def can_delta(self, epoch: str | None, cursor: int) -> bool:
+        return epoch == self.epoch and self._horizon <= cursor <= self.revision
+
+    def removed_since(self, cursor: int) -> list[str]:
+        return [entry_id for entry_id, revision in self._removed.items() if revision > cursor]
+
+
+@callback
+def async_get_revision_log(hass: HomeAssistant) -> RevisionLog:
+    """Return the integration-wide RevisionLog, creating it on first use."""
+    log: RevisionLog | None = hass.data.get(DATA_REVISIONS)
+    if log is None:
+        log = hass.data[DATA_REVISIONS] = RevisionLog()
+    return log
@@ -199,3 +199,72 @@ def action_snapshot(options: dict, data: dict) -> dict:
         "start_action": options.get(CONF_ONOFF_START_ACTION, "on"),
         "end_action": options.get(CONF_ONOFF_END_ACTION, "off"),
     }
+
+
+# State a target must already be in for a service call to be a no-op, per
+# service: (required state or None, {data key: attribute it's compared to}).
+# Only calls whose data keys are all listed here can be judged; anything else
+# (custom services, extra data such as a transition) is always sent.
+_SATISFIED_BY = {
+    "turn_on": ("on", {"brightness_pct": "brightness"}),
+    "turn_off": ("off", {}),
+    "open_cover": ("open", {}),
+    "close_cover": ("closed", {}),
+    "set_cover_position": (None, {"position": "current_position"}),
+    "lock": ("locked", {}),
+    "unlock": ("unlocked", {}),
+    "set_hvac_mode": (None, {"hvac_mode": None}),
+    "set_operation_mode": (None, {"operation_mode": None}),
+    "set_temperature": (None, {"temperature": "temperature"}),
+}
+
+
+def state_checkable(service: str, data: dict) -> bool:
+    """Whether already_satisfied() can judge this call at all.
+
+    Calls it can't (custom services, extra data) are always sent, and
+    can't be confirmed by verified dispatch either.
+    """
+    rule = _SATISFIED_BY.get(service)
+    return rule is not None and all(key in rule[1] for key in (data or {}))
+
+
+def already_satisfied(state, service: str, data: dict) -> bool:
+    """Whether a target in `state` (a HA State, or None) needs no `service` call.
+
+    Used by idempotent dispatch (CONF_IDEMPOTENT) to drop targets whose
+    state already matches what build_runtime_action_updates() resolved the
+    action to: cover open/closed/position, light on/off/brightness_pct,
+    climate hvac_mode/temperature, water heater mode/temperature, lock
+    state. When in doubt (unknown service, unavailable entity, an attribute
+    the entity doesn't report) the answer is no, so the call goes out.
+    """
+    if state is None or state.state in ("unavailable", "unknown"):
+        return False
+    if not state_checkable(service, data):
+        return False
+    required_state, attributes = _SATISFIED_BY[service]
+    data = data or {}
+    if required_state is not None and state.state != required_state:
+        return False
+
+    for key, wanted in data.items():
+        attribute = attributes[key]
+        if attribute is None:
+            # The mode is the entity's state itself.
+            if state.state != wanted:
+                return False
+            continue
+        current = state.attributes.get(attribute)
+        if current is None:
+            return False
+        try:
+            if key == "brightness_pct":
+                # Lights report 0-255; allow for rounding either way.
+                if abs(float(current) - float(wanted) * 255 / 100) > 1.5:
+                    return False
+            elif float(current) != float(wanted):
+                return False
+        except (TypeError, ValueError):
+            return False
+    return True
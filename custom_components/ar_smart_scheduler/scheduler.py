@@ -1,21 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
 import logging
 from dataclasses import dataclass
+from collections.abc import Iterable
 from typing import Any, Optional, Set
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.event import (
-    async_track_point_in_utc_time,
-    async_track_state_change_event,
-    async_track_time_change,
-)
 from homeassistant.util import dt as dt_util
 
 from .const import (
+    CATCH_UP_RUN_LATEST,
+    CATCH_UP_SKIP,
+    CONF_CATCH_UP,
     CONF_DEVICE_TYPE,
     CONF_ENABLED,
     CONF_END,
@@ -23,6 +23,8 @@ from .const import (
     CONF_END_OFFSET,
     CONF_END_SERVICE,
     CONF_END_TRIGGER,
+    CONF_LEAN,
+    CONF_RECONCILE,
     CONF_SECOND_ENABLED,
     CONF_SECOND_END,
     CONF_SECOND_END_OFFSET,
@@ -35,13 +37,15 @@ from .const import (
     CONF_START_OFFSET,
     CONF_START_SERVICE,
     CONF_START_TRIGGER,
-    CONF_TARGET_ENTITY,
     CONF_WEEKDAYS,
+    DEFAULT_CATCH_UP,
     DEFAULT_END,
     DEFAULT_END_DATA,
     DEFAULT_END_OFFSET,
     DEFAULT_END_SERVICE,
     DEFAULT_END_TRIGGER,
+    DEFAULT_LEAN,
+    DEFAULT_RECONCILE,
     DEFAULT_SECOND_ENABLED,
     DEFAULT_SECOND_END,
     DEFAULT_SECOND_END_OFFSET,
@@ -57,18 +61,30 @@ from .const import (
     DEFAULT_WEEKDAYS,
     SIGNAL_END2_UPDATED,
     SIGNAL_END_UPDATED,
+    SIGNAL_INFO_UPDATED,
+    SIGNAL_SCHEDULER_CHANGED,
     SIGNAL_START2_UPDATED,
     SIGNAL_START_UPDATED,
     SIGNAL_UPDATED,
     SUN_ENTITY_ID,
     TRIGGER_SUNRISE,
     TRIGGER_SUNSET,
-    TRIGGER_TIME,
     TRIGGER_TYPES,
     WEEKDAY_KEYS,
     WEEKDAY_MAP,
 )
-from .runtime_actions import action_snapshot, detect_device_type
+from .action_plan import ActionPlan, PlannedAction, PlannedCall, compile_action_plan
+from .command_queue import async_get_command_queue
+from .dispatch import ServiceBatch, freeze
+from .mutations import MutationBuffer
+from .occurrences import OccurrenceCalendar, weekday_mask
+from .revisions import async_get_revision_log
+from .runtime_actions import already_satisfied
+from .solar import async_get_ephemeris
+from .store import async_get_runtime_store
+from .throttle import async_get_dispatch_throttle
+from .timer_heap import async_get_timer_heap
+from .verify import VERIFY_BACKOFF, VERIFY_RETRIES, VERIFY_TIMEOUT, async_wait_for_states
 
 
 def _parse_time(value: str | None, fallback: str) -> dt.time:
@@ -95,12 +111,33 @@ def _parse_offset(value: Any, fallback: int = 0) -> int:
         return fallback
 
 
-def _normalize_targets(targets) -> list[str]:
-    if not targets:
-        return []
-    if isinstance(targets, str):
-        return [targets]
-    return [target for target in targets if isinstance(target, str)]
+# Entity signals an option change has to wake, on top of SIGNAL_INFO_UPDATED
+# (which every change sends). Keys not listed here - device type, action
+# choices, resolved services/data - feed the start/end action entities.
+_OPTION_SIGNALS: dict[str, tuple[str, ...]] = {
+    CONF_ENABLED: (SIGNAL_UPDATED,),
+    CONF_WEEKDAYS: (SIGNAL_UPDATED,),
+    CONF_START: (SIGNAL_START_UPDATED,),
+    CONF_START_TRIGGER: (SIGNAL_START_UPDATED,),
+    CONF_START_OFFSET: (SIGNAL_START_UPDATED,),
+    CONF_END: (SIGNAL_END_UPDATED,),
+    CONF_END_TRIGGER: (SIGNAL_END_UPDATED,),
+    CONF_END_OFFSET: (SIGNAL_END_UPDATED,),
+    CONF_SECOND_ENABLED: (SIGNAL_START2_UPDATED, SIGNAL_END2_UPDATED),
+    CONF_SECOND_START: (SIGNAL_START2_UPDATED,),
+    CONF_SECOND_START_TRIGGER: (SIGNAL_START2_UPDATED,),
+    CONF_SECOND_START_OFFSET: (SIGNAL_START2_UPDATED,),
+    CONF_SECOND_END: (SIGNAL_END2_UPDATED,),
+    CONF_SECOND_END_TRIGGER: (SIGNAL_END2_UPDATED,),
+    CONF_SECOND_END_OFFSET: (SIGNAL_END2_UPDATED,),
+}
+_ACTION_SIGNALS = (SIGNAL_START_UPDATED, SIGNAL_END_UPDATED)
+
+# Why _async_fire ran an action: its timer went off, the startup
+# catch-up policy re-ran it, or startup reconciliation re-applied it.
+FIRE_SCHEDULED = "scheduled"
+FIRE_CATCH_UP = "catch_up"
+FIRE_RECONCILE = "reconcile"
 
 
 @dataclass
@@ -131,12 +168,72 @@ class ARScheduler:
         self.hass = hass
         self.entry = entry
         self.logger = logging.getLogger(__name__).getChild(entry.entry_id)
-
-        self._unsub_start: Optional[callable] = None
-        self._unsub_end: Optional[callable] = None
-        self._unsub_start2: Optional[callable] = None
-        self._unsub_end2: Optional[callable] = None
-        self._unsub_sun_state: Optional[callable] = None
+        # Set by async_setup_entry (lean mode loads fewer), along with the
+        # device type the action number/select entities were created for.
+        self.platforms: list = []
+        self.entity_device_type: Optional[str] = None
+
+        # Fire timers live in the integration-wide heap, keyed by
+        # (entry_id, which) - see timer_heap.py.
+        self._timers = async_get_timer_heap(hass)
+        # Bumped per track whenever that track is torn down, so a fire that
+        # was already in flight doesn't re-arm itself from the old settings
+        # afterwards.
+        self._track_generation: dict[str, int] = {
+            "start": 0,
+            "end": 0,
+            "start2": 0,
+            "end2": 0,
+        }
+        # Signature of every currently-armed track (see _track_signatures),
+        # so a reload only rebuilds the tracks whose settings changed.
+        self._armed: dict[str, tuple] = {}
+        self._ephemeris = async_get_ephemeris(hass)
+        self._unsub_solar: Optional[callable] = None
+        self._solar_subscribed: frozenset[str] = frozenset()
+
+        # Entity signals queued for the end of this loop iteration (see
+        # _dispatch_updates), and the entry contents the current State was
+        # loaded from (to work out which signals a reload needs).
+        self._pending_signals: set[str] = set()
+        self._mutations = MutationBuffer(hass, entry, self.async_reload_from_entry)
+        self._flush_scheduled = False
+
+        # Re-stamped from the integration-wide RevisionLog whenever anything in the
+        # memoized part of build_state_snapshot() changes. That part is rebuilt
+        # when it moves (the live fields are merged in per call, see
+        # build_state_snapshot) and ar_smart_scheduler/list deltas are cut on it.
+        self._revisions = async_get_revision_log(hass)
+        self._revisions.forget_removed(entry.entry_id)
+        self.revision = 0
+        self._snapshot: Optional[dict[str, Any]] = None
+        self._snapshot_revision = -1
+        self._loaded_fingerprint: tuple = ()
+        self.reloads_applied = 0
+        self.reloads_skipped = 0
+        # Service calls of this scheduler's fires that raised (see
+        # _record_call_failure), and the most recent one.
+        self.call_failures = 0
+        self._last_call_failure: Optional[dict[str, Any]] = None
+        # Idempotent dispatch (CONF_IDEMPOTENT): calls dropped outright
+        # because every target in them was already in the wanted state, and
+        # targets left out of calls that still went out.
+        self.calls_avoided = 0
+        self.targets_skipped = 0
+        # Seconds each target's last command was held back by the
+        # integration-wide DispatchThrottle.
+        self._dispatch_delays: dict[str, float] = {}
+        # Commands of this scheduler's that were still waiting behind a busy
+        # target when a newer one for it came in, so were never sent.
+        self.commands_superseded = 0
+        # Verified dispatch (CONF_VERIFY): the task confirming the latest
+        # fire, and how that went.
+        self._verify_task: Optional[asyncio.Task] = None
+        self._last_verification: Optional[dict[str, Any]] = None
+        # Latest catch-up/reconcile action (see _async_fire).
+        self._last_recovery: Optional[dict[str, Any]] = None
+        self._loaded_options: dict[str, Any] = {}
+        self._loaded_data: dict[str, Any] = {}
 
         self._next_fire: dict[str, Optional[dt.datetime]] = {
             "start": None,
@@ -157,9 +254,7 @@ class ARScheduler:
             "end2": None,
         }
         # Raw solar event time (before offset) each pending fire was derived
-        # from. Needed so sun.sun updates can tell a *moved* event apart from
-        # the attribute simply rolling over to tomorrow's event while a
-        # positive-offset fire for today's event is still pending.
+        # from, as computed by the shared SolarEphemeris.
         self._solar_base: dict[str, Optional[dt.datetime]] = {
             "start": None,
             "end": None,
@@ -167,6 +262,22 @@ class ARScheduler:
             "end2": None,
         }
 
+        # Restore what the previous run persisted (store.py). Last run times
+        # carry straight over; the fires that were pending at shutdown are
+        # kept aside - the tracks get re-armed from scratch below - so a
+        # fire that fell into the downtime can still be spotted.
+        self._runtime_store = async_get_runtime_store(hass)
+        self._stopped = False
+        persisted = self._runtime_store.get(entry.entry_id)
+        for which, when in persisted["last_run"].items():
+            if which in self._last_run:
+                self._last_run[which] = when
+        self.persisted_next_fire: dict[str, Optional[dt.datetime]] = {
+            which: when for which, when in persisted["next_fire"].items() if which in self._next_fire
+        }
+        # Latest missed fire per track, waiting for async_catch_up.
+        self._missed: dict[str, dt.datetime] = {}
+
         self.state = State(
             enabled=True,
             start=dt.time(6, 0, 0),
@@ -192,22 +303,55 @@ class ARScheduler:
         self._load()
 
     @property
-    def targets(self) -> list[str]:
-        return _normalize_targets(self.entry.data.get(CONF_TARGET_ENTITY))
+    def targets(self) -> tuple[str, ...]:
+        return self.plan.targets
 
     @property
     def sun_available(self) -> bool:
+        """Whether sun.sun exists. Informational only - solar tracks are
+        computed locally (solar.py) and no longer wait for it."""
         return self.hass.states.get(SUN_ENTITY_ID) is not None
 
+    def _bump_revision(self) -> None:
+        self.revision = self._revisions.next_revision()
+        # Snapshot changed - let ar_smart_scheduler/subscribe clients know at
+        # the end of this loop iteration even if no entity needs waking.
+        self._schedule_flush()
+
     def build_state_snapshot(self) -> dict[str, Any]:
+        """Everything the card/info sensor shows, mostly memoized per revision.
+
+        Called once per scheduler for every ar_smart_scheduler/list request
+        and every info sensor attribute read. The bulk of it is built once
+        per revision; each call returns a new, shallow dict merging that
+        memoized part with the few fields that change without a revision
+        bump (sun.sun appearing or going away, the reload counters), read
+        fresh. Don't rely on getting the same dict back between calls, and
+        treat the nested values as read-only - they're shared with the memo.
+        """
+        if self._snapshot is None or self._snapshot_revision != self.revision:
+            self._snapshot = self._build_state_snapshot()
+            self._snapshot_revision = self.revision
+        return {
+            **self._snapshot,
+            "sun_available": self.sun_available,
+            "reloads": {"applied": self.reloads_applied, "skipped": self.reloads_skipped},
+        }
+
+    def _build_state_snapshot(self) -> dict[str, Any]:
         return {
             "entry_id": self.entry.entry_id,
             "name": self.entry.data.get("name", self.entry.title),
             "enabled": self.state.enabled,
+            "lean": bool(self.entry.options.get(CONF_LEAN, DEFAULT_LEAN)),
+            "catch_up": self.entry.options.get(CONF_CATCH_UP, DEFAULT_CATCH_UP),
+            "reconcile_on_start": bool(self.entry.options.get(CONF_RECONCILE, DEFAULT_RECONCILE)),
+            "idempotent_dispatch": self.plan.idempotent,
+            "verify_dispatch": self.plan.verify,
             "targets": list(self.targets),
-            "device_type": detect_device_type(self.entry.options, self.entry.data),
+            "device_type": self.plan.device_type,
             "device_type_setting": self.entry.options.get(CONF_DEVICE_TYPE, "auto"),
-            "actions": action_snapshot(self.entry.options, self.entry.data),
+            "actions": dict(self.plan.actions),
             "weekdays": [WEEKDAY_KEYS[index] for index in sorted(self.state.weekdays)],
             "start_time": self.state.start.strftime("%H:%M:%S"),
             "end_time": self.state.end.strftime("%H:%M:%S"),
@@ -227,14 +371,43 @@ class ARScheduler:
             "start_data": dict(self.state.start_data),
             "end_data": dict(self.state.end_data),
             "sun_entity_id": SUN_ENTITY_ID,
-            "sun_available": self.sun_available,
             "next_fire": {key: self._format_datetime(value) for key, value in self._next_fire.items()},
             "last_run": {key: self._format_datetime(value) for key, value in self._last_run.items()},
             "solar_messages": dict(self._solar_messages),
+            "call_failures": {"count": self.call_failures, "last": self._last_call_failure},
+            "calls_avoided": {"calls": self.calls_avoided, "targets": self.targets_skipped},
+            "dispatch_delays": dict(self._dispatch_delays),
+            "commands_superseded": self.commands_superseded,
+            "verification": self._last_verification,
+            "recovery": self._last_recovery,
         }
 
+    def next_run(self) -> tuple[Optional[str], Optional[dt.datetime]]:
+        """(track, when) of the earliest pending fire, or (None, None)."""
+        pending = [(when, which) for which, when in self._next_fire.items() if when is not None]
+        if not pending:
+            return None, None
+        when, which = min(pending)
+        return which, when
+
+    def last_run(self) -> tuple[Optional[str], Optional[dt.datetime]]:
+        """(track, when) of the most recent fire, or (None, None)."""
+        fired = [(when, which) for which, when in self._last_run.items() if when is not None]
+        if not fired:
+            return None, None
+        when, which = max(fired)
+        return which, when
+
+    def _entry_fingerprint(self) -> tuple:
+        """What a reload is built from - equal fingerprints, identical reloads."""
+        return (freeze(dict(self.entry.options or {})), freeze(dict(self.entry.data or {})), self.entry.title)
+
     def _load(self) -> None:
-        opts = dict(self.entry.options or {})
+        self._bump_revision()
+        self._loaded_fingerprint = self._entry_fingerprint()
+        self._loaded_options = dict(self.entry.options or {})
+        self._loaded_data = dict(self.entry.data or {})
+        opts = dict(self._loaded_options)
 
         opts.setdefault(CONF_START_TRIGGER, DEFAULT_START_TRIGGER)
         opts.setdefault(CONF_END_TRIGGER, DEFAULT_END_TRIGGER)
@@ -281,28 +454,113 @@ class ARScheduler:
         self.state.start_data = dict(sd) if isinstance(sd, dict) else {}
         self.state.end_data = dict(ed) if isinstance(ed, dict) else {}
 
+        self.plan: ActionPlan = compile_action_plan(
+            self._loaded_options,
+            self._loaded_data,
+            self.state.start_service,
+            self.state.start_data,
+            self.state.end_service,
+            self.state.end_data,
+        )
+
+        self._weekday_mask = weekday_mask(self.state.weekdays)
+        self._calendars = {
+            "start": OccurrenceCalendar(self._weekday_mask, self.state.start),
+            "end": OccurrenceCalendar(self._weekday_mask, self.state.end),
+            "start2": OccurrenceCalendar(self._weekday_mask, self.state.second_start),
+            "end2": OccurrenceCalendar(self._weekday_mask, self.state.second_end),
+        }
+
     async def async_start(self) -> None:
-        self._setup_tracks()
+        self._sync_tracks()
+        self._collect_downtime_misses(dt_util.utcnow())
+        if self._missed and self.hass.is_running:
+            # Set up after startup (added or re-enabled later), so the
+            # startup-wide catch-up pass has already run.
+            self.hass.async_create_task(self._async_catch_up_alone())
 
     async def async_stop(self) -> None:
+        self._stopped = True
+        self._mutations.async_flush()
         self._remove_tracks()
+        if self._verify_task is not None:
+            self._verify_task.cancel()
+            self._verify_task = None
 
     async def async_reload_from_entry(self) -> None:
+        """Re-read the entry and re-arm only the tracks whose settings changed.
+
+        Toggling one weekday switch or nudging one offset used to tear down
+        and re-arm every timer and the solar subscription. Untouched tracks
+        now keep their pending fire (and _solar_base) as-is, which also
+        closes the window in which a full teardown could drop a fire that
+        was due mid-reload.
+
+        Every write to the entry reaches here at least twice - once from
+        whoever made it (the mutation buffer) and once from the entry's
+        update listener - so each reload is tagged with the fingerprint of
+        the options/data/title it was built from, and a reload for the same
+        fingerprint as the current one is skipped (and counted in
+        reloads_skipped, which build_state_snapshot reads live).
+        """
+        if self._entry_fingerprint() == self._loaded_fingerprint:
+            self.reloads_skipped += 1
+            self.logger.debug("Skipping reload of %s: entry unchanged", self.entry.entry_id)
+            return
+
+        self.reloads_applied += 1
+        previous_options, previous_data = self._loaded_options, self._loaded_data
         self._load()
-        self._setup_tracks()
-        self._dispatch_updates()
+        self._sync_tracks()
+        self._dispatch_updates(self._signals_for_changes(previous_options, previous_data))
+
+    def _signals_for_changes(self, previous_options: dict, previous_data: dict) -> set[str]:
+        signals: set[str] = set()
+        if previous_data != self._loaded_data:
+            # Targets feed the auto-detected device type.
+            signals.update(_ACTION_SIGNALS)
+        for key in previous_options.keys() | self._loaded_options.keys():
+            if previous_options.get(key) != self._loaded_options.get(key):
+                signals.update(_OPTION_SIGNALS.get(key, _ACTION_SIGNALS))
+        return signals
 
     def _remove_tracks(self) -> None:
-        for attr in ("_unsub_start", "_unsub_end", "_unsub_start2", "_unsub_end2", "_unsub_sun_state"):
-            unsub = getattr(self, attr)
-            if unsub:
-                unsub()
-                setattr(self, attr, None)
+        for which in list(self._armed):
+            self._remove_track(which)
+        self._set_solar_subscription(frozenset())
+
+    def _remove_track(self, which: str) -> None:
+        self._timers.async_cancel(self.entry.entry_id, which)
+        self._track_generation[which] += 1
+        self._armed.pop(which, None)
+        self._bump_revision()
+        self._next_fire[which] = None
+        self._solar_messages[which] = None
+        self._solar_base[which] = None
+
+    def _track_signatures(self) -> dict[str, tuple]:
+        """Everything that determines when each active track fires."""
+        if not self.state.enabled:
+            return {}
+        signatures = {}
+        for which, trigger, when, offset in self._track_definitions():
+            if trigger in (TRIGGER_SUNRISE, TRIGGER_SUNSET):
+                signatures[which] = (trigger, offset, self._weekday_mask)
+            else:
+                signatures[which] = (trigger, when, self._weekday_mask)
+        return signatures
 
-        for key in self._next_fire:
-            self._next_fire[key] = None
-            self._solar_messages[key] = None
-            self._solar_base[key] = None
+    def _set_solar_subscription(self, triggers: frozenset[str]) -> None:
+        if triggers == self._solar_subscribed:
+            return
+        if self._unsub_solar:
+            self._unsub_solar()
+            self._unsub_solar = None
+        self._solar_subscribed = triggers
+        if triggers:
+            self._unsub_solar = self._ephemeris.async_subscribe(
+                self.entry.entry_id, set(triggers), self._handle_solar_change
+            )
 
     def _track_definitions(self) -> list[tuple[str, str, dt.time, int]]:
         """(which, trigger, time, offset) for every active track."""
@@ -327,73 +585,96 @@ class ARScheduler:
             "end2": self._handle_end2,
         }[which]
 
-    def _setup_tracks(self) -> None:
-        self._remove_tracks()
+    def _sync_tracks(self) -> None:
+        """Bring the armed tracks in line with self.state, touching only what changed."""
+        wanted = self._track_signatures()
 
-        if not self.state.enabled:
-            return
+        for which in [which for which in self._armed if self._armed[which] != wanted.get(which)]:
+            self._remove_track(which)
 
-        if self._uses_solar_triggers():
-            self._unsub_sun_state = async_track_state_change_event(
-                self.hass,
-                SUN_ENTITY_ID,
-                self._handle_sun_state_change,
-            )
+        self._set_solar_subscription(
+            frozenset(self._solar_triggers()) if self.state.enabled else frozenset()
+        )
 
         for which, trigger, when, offset in self._track_definitions():
+            if which not in wanted or which in self._armed:
+                continue
+            self._armed[which] = wanted[which]
             self._setup_single_track(which, trigger, when, offset, self._handler_for(which))
 
     def _setup_single_track(self, which, trigger, when, offset_minutes, handler):
-        unsub_attr = f"_unsub_{which}"
         if trigger in (TRIGGER_SUNRISE, TRIGGER_SUNSET):
             self._schedule_next_solar_track(which, trigger, offset_minutes, handler)
             return
 
-        self._next_fire[which] = self._compute_next_time_fire(when)
         self._solar_messages[which] = None
         self._solar_base[which] = None
-        setattr(
-            self,
-            unsub_attr,
-            async_track_time_change(
-                self.hass,
-                handler,
-                hour=when.hour,
-                minute=when.minute,
-                second=when.second,
-            ),
-        )
+        self._schedule_next_time_track(which, handler)
 
-    def _compute_next_time_fire(self, when: dt.time) -> Optional[dt.datetime]:
-        """Next local occurrence of a fixed time, honouring the weekday mask."""
-        if not self.state.weekdays:
-            return None
+    def _schedule_next_time_track(self, which, handler) -> None:
+        """Arm the exact next occurrence of a fixed-time track.
 
-        now = dt_util.now()
-        for day_delta in range(8):
-            candidate_date = (now + dt.timedelta(days=day_delta)).date()
-            candidate = dt.datetime.combine(candidate_date, when, tzinfo=now.tzinfo)
-            if candidate <= now:
-                continue
-            if candidate.weekday() in self.state.weekdays:
-                return dt_util.as_utc(candidate)
-        return None
+        The compiled OccurrenceCalendar already skips disallowed weekdays, so
+        the one-shot heap entry is only ever armed for a day the track really
+        runs on, and re-arms itself after each fire.
+        """
+        scheduled = self._calendars[which].next_after()
+        self._bump_revision()
+        self._next_fire[which] = scheduled
+        if scheduled is None:
+            return
+
+        generation = self._track_generation[which]
+
+        async def _run(now: dt.datetime, batch: ServiceBatch) -> None:
+            try:
+                await handler(now, batch)
+            finally:
+                if generation == self._track_generation[which]:
+                    self._schedule_next_time_track(which, handler)
+
+        self._timers.async_schedule(self.entry.entry_id, which, scheduled, _run)
+
+    def _dispatch_updates(self, signals: Optional[set[str]] = None) -> None:
+        """Tell this entry's entities that something changed.
+
+        Only the info sensor is always woken; `signals` adds whichever entity
+        groups the change actually touches (fires and solar reschedules pass
+        nothing). Every call in the same loop iteration is merged into one
+        send per signal, so a burst of changes costs each entity one state
+        write instead of one per change.
+        """
+        self._pending_signals.add(SIGNAL_INFO_UPDATED)
+        if signals:
+            self._pending_signals.update(signals)
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.loop.call_soon(self._flush_updates)
 
-    def _dispatch_updates(self) -> None:
-        for signal in (
-            SIGNAL_UPDATED,
-            SIGNAL_START_UPDATED,
-            SIGNAL_END_UPDATED,
-            SIGNAL_START2_UPDATED,
-            SIGNAL_END2_UPDATED,
-        ):
+    @callback
+    def _flush_updates(self) -> None:
+        self._flush_scheduled = False
+        signals, self._pending_signals = self._pending_signals, set()
+        for signal in signals:
             async_dispatcher_send(self.hass, f"{signal}_{self.entry.entry_id}")
+        if not self._stopped:
+            # Not once stopped: tearing the tracks down clears _next_fire,
+            # and that's not the state to come back up with.
+            self._runtime_store.async_update(
+                self.entry.entry_id,
+                {"last_run": self._last_run, "next_fire": self._next_fire, "solar_base": self._solar_base},
+            )
+        async_dispatcher_send(self.hass, SIGNAL_SCHEDULER_CHANGED, self.entry.entry_id)
 
-    def _uses_solar_triggers(self) -> bool:
-        return any(
-            trigger in (TRIGGER_SUNRISE, TRIGGER_SUNSET)
+    def _solar_triggers(self) -> set[str]:
+        return {
+            trigger
             for _, trigger, _, _ in self._track_definitions()
-        )
+            if trigger in (TRIGGER_SUNRISE, TRIGGER_SUNSET)
+        }
 
     def _format_datetime(self, value: Optional[dt.datetime]) -> Optional[str]:
         if value is None:
@@ -404,39 +685,15 @@ class ARScheduler:
         self, trigger: str, offset_minutes: int
     ) -> tuple[Optional[dt.datetime], Optional[dt.datetime], Optional[str]]:
         """Return (scheduled_fire, base_event, message) for a solar trigger."""
-        sun_state = self.hass.states.get(SUN_ENTITY_ID)
-        if sun_state is None:
-            return None, None, f"{SUN_ENTITY_ID} is unavailable"
-
-        attr = "next_rising" if trigger == TRIGGER_SUNRISE else "next_setting"
-        raw = sun_state.attributes.get(attr)
-        if raw is None:
-            return None, None, f"{SUN_ENTITY_ID} has no {attr} attribute"
-
-        event_time = raw if isinstance(raw, dt.datetime) else dt_util.parse_datetime(str(raw))
-        if event_time is None:
-            return None, None, f"Could not parse {attr} from {SUN_ENTITY_ID}"
-
-        event_time = dt_util.as_utc(event_time)
-        scheduled = event_time + dt.timedelta(minutes=offset_minutes)
-        if scheduled <= dt_util.utcnow():
-            # Negative offset (or exact-instant race) puts the fire in the
-            # past even though the event itself is the next one. Approximate
-            # tomorrow's event; the sun.sun state listener corrects this to
-            # the exact time once the attribute rolls over.
-            scheduled += dt.timedelta(days=1)
-            event_time += dt.timedelta(days=1)
-
-        return scheduled, event_time, None
+        if not self._weekday_mask:
+            return None, None, "No weekdays selected"
+        return self._ephemeris.next_fire(trigger, offset_minutes, mask=self._weekday_mask)
 
     def _schedule_next_solar_track(self, which, trigger, offset_minutes, handler) -> None:
-        unsub_attr = f"_unsub_{which}"
-        existing = getattr(self, unsub_attr)
-        if existing:
-            existing()
-            setattr(self, unsub_attr, None)
+        self._timers.async_cancel(self.entry.entry_id, which)
 
         scheduled, base_event, message = self._resolve_next_solar_event(trigger, offset_minutes)
+        self._bump_revision()
         self._next_fire[which] = scheduled
         self._solar_base[which] = base_event
         self._solar_messages[which] = message
@@ -445,50 +702,39 @@ class ARScheduler:
             self.logger.warning("Unable to schedule %s trigger for %s: %s", trigger, which, message)
             return
 
-        async def _run(now: dt.datetime) -> None:
-            await handler(now)
-            self._schedule_next_solar_track(which, trigger, offset_minutes, handler)
-            self._dispatch_updates()
+        generation = self._track_generation[which]
 
-        setattr(
-            self,
-            unsub_attr,
-            async_track_point_in_utc_time(self.hass, _run, scheduled),
-        )
+        async def _run(now: dt.datetime, batch: ServiceBatch) -> None:
+            try:
+                await handler(now, batch)
+            finally:
+                if generation == self._track_generation[which]:
+                    self._schedule_next_solar_track(which, trigger, offset_minutes, handler)
+                    self._dispatch_updates()
+
+        self._timers.async_schedule(self.entry.entry_id, which, scheduled, _run)
 
     @callback
-    def _handle_sun_state_change(self, event) -> None:
+    def _handle_solar_change(self, moved: set[str]) -> None:
+        """SolarEphemeris callback: solar times for `moved` may have changed."""
         if not self.state.enabled:
             return
 
         changed = False
         now_utc = dt_util.utcnow()
         for which, trigger, _, offset_minutes in self._track_definitions():
-            if trigger not in (TRIGGER_SUNRISE, TRIGGER_SUNSET):
+            if trigger not in moved:
                 continue
 
             pending = self._next_fire.get(which)
-            base = self._solar_base.get(which)
 
             # NEVER cancel a timer that is due right now / overdue — it is in
-            # the middle of firing and will reschedule itself. sun.sun rolls
-            # its next_rising/next_setting attribute over at the exact moment
-            # of the event, so this handler races the trigger timer; losing
-            # that race used to cancel the fire entirely.
+            # the middle of firing and will reschedule itself.
             if pending is not None and pending <= now_utc:
                 continue
 
-            # A pending fire whose base event has already passed is the tail
-            # of a positive offset (e.g. sunset +15 min, sunset was 5 min
-            # ago). sun.sun now reports TOMORROW's event — that is not a
-            # moved event, so leave today's pending fire alone. It will
-            # reschedule from fresh data after it fires.
-            if pending is not None and base is not None and base <= now_utc:
-                continue
-
-            # Only reschedule when the resolved solar time actually moved.
-            # sun.sun updates its state frequently; tearing down and
-            # recreating timers on every update is wasteful.
+            # A location change can leave the fire where it was (e.g. a few
+            # metres of elevation) - only re-arm when it actually moved.
             scheduled, _base_event, message = self._resolve_next_solar_event(trigger, offset_minutes)
             if scheduled == pending and message == self._solar_messages.get(which):
                 continue
@@ -499,77 +745,339 @@ class ARScheduler:
         if changed:
             self._dispatch_updates()
 
-    def _today_allowed(self) -> bool:
-        if not self.state.weekdays:
+    def _previous_fire(self, which: str, now: dt.datetime) -> Optional[dt.datetime]:
+        """Latest time track `which` was due at or before `now`."""
+        for track, trigger, _, offset_minutes in self._track_definitions():
+            if track != which:
+                continue
+            if trigger in (TRIGGER_SUNRISE, TRIGGER_SUNSET):
+                if not self._weekday_mask:
+                    return None
+                return self._ephemeris.previous_fire(trigger, offset_minutes, now, self._weekday_mask)
+            return self._calendars[which].last_at_or_before(now)
+        return None
+
+    def _note_missed(self, which: str, now: dt.datetime) -> None:
+        latest = self._previous_fire(which, now)
+        if latest is not None:
+            self.logger.warning("Missed %s fire due %s", which, latest)
+            self._missed[which] = latest
+
+    def _collect_downtime_misses(self, now: dt.datetime) -> None:
+        """Note every track whose fire pending at the last shutdown has passed."""
+        for which, pending in self.persisted_next_fire.items():
+            if pending is None or pending > now or which not in self._armed:
+                continue
+            last_run = self._last_run.get(which)
+            if last_run is not None and last_run >= pending:
+                continue
+            self._note_missed(which, now)
+        self.persisted_next_fire = {}
+
+    def current_window(self, now: dt.datetime) -> Optional[str]:
+        """The track whose action the schedule implies at `now`.
+
+        That's whichever armed track was due most recently: a start means
+        `now` falls inside that window, an end means it falls between
+        windows. None when nothing is armed (disabled, no weekdays, no sun).
+        """
+        due = {track: self._previous_fire(track, now) for track in self._armed}
+        due = {track: when for track, when in due.items() if when is not None}
+        if not due:
+            return None
+        return max(due, key=due.__getitem__)
+
+    async def async_catch_up(self, now: dt.datetime, batch: ServiceBatch) -> bool:
+        """Apply this scheduler's CONF_CATCH_UP policy to the fires it missed.
+
+        skip - log and move on (the behaviour before catch-up existed);
+        run_latest - re-run the most recent missed fire; apply_window_state
+        - run whichever track was due most recently, missed or not, so the
+        targets end up in the state the schedule implies right now. At most
+        one action per scheduler either way; returns whether one was run.
+        """
+        if not self._missed:
+            return False
+        missed, self._missed = self._missed, {}
+        policy = self.entry.options.get(CONF_CATCH_UP, DEFAULT_CATCH_UP)
+        if not self.state.enabled or policy == CATCH_UP_SKIP:
+            self.logger.info("Not catching up on missed fire(s) %s (policy %s)", sorted(missed), policy)
             return False
-        now = dt_util.now()
-        return now.weekday() in self.state.weekdays
 
-    async def _call_targets(self, service: str, data: dict[str, Any]) -> None:
-        targets = self.targets
-        if not targets:
+        if policy == CATCH_UP_RUN_LATEST:
+            which = max(missed, key=missed.__getitem__)
+        else:
+            which = self.current_window(now)
+            if which is None:
+                return False
+
+        self.logger.info("Catching up: running %s (policy %s)", which, policy)
+        await self._async_fire(which, batch, reason=FIRE_CATCH_UP)
+        return True
+
+    async def async_reconcile(self, now: dt.datetime, batch: ServiceBatch) -> bool:
+        """Re-send the action for the window `now` falls in (CONF_RECONCILE).
+
+        Arming timers on startup only covers what's still ahead, so a
+        restart at 10:00 inside a 06:00-18:00 window left the targets in
+        whatever state they came up in until 18:00. Opted-in schedulers get
+        their current window's start/end action once, from the startup
+        pass in catchup.py. Returns whether anything was sent.
+        """
+        if not self.state.enabled or not self.entry.options.get(CONF_RECONCILE, DEFAULT_RECONCILE):
+            return False
+        which = self.current_window(now)
+        if which is None:
+            return False
+        self.logger.debug("Reconciling: applying %s for the current window", which)
+        await self._async_fire(which, batch, reason=FIRE_RECONCILE)
+        return True
+
+    async def _async_catch_up_alone(self) -> None:
+        batch = ServiceBatch()
+        await self.async_catch_up(dt_util.utcnow(), batch)
+        await batch.async_flush(self.hass)
+
+    async def _call_targets(
+        self,
+        action: PlannedAction,
+        batch: Optional[ServiceBatch] = None,
+        entity_ids: Optional[list[str]] = None,
+    ) -> None:
+        """Make `action`'s calls to every target (or just `entity_ids`).
+
+        The calls - one per entity domain - come pre-built from the
+        ActionPlan. With a batch (every heap-driven fire), they're only
+        collected and go out merged with whatever else fired in the same
+        wake-up; otherwise they go out through a batch of their own. Either
+        way the per-domain calls are issued concurrently (paced per
+        integration and ordered per target, see throttle.py and
+        command_queue.py), and a domain whose call raises doesn't stop the
+        others - the failure is recorded against this scheduler instead.
+        """
+        calls: Iterable[PlannedCall] = action.calls
+        if entity_ids is not None:
+            calls = [call for call in (planned.restricted(entity_ids) for planned in calls) if call is not None]
+        if self.plan.idempotent:
+            calls = self._drop_satisfied(calls, action)
+        if not calls:
             return
 
-        if "." in service:
-            domain, service = service.split(".", 1)
-        else:
-            domain = None
-
-        by_domain: dict[str, list[str]] = {}
-        for ent in targets:
-            ent_domain = ent.split(".", 1)[0]
-            by_domain.setdefault(ent_domain, []).append(ent)
-
-        for ent_domain, entity_ids in by_domain.items():
-            payload = dict(data or {})
-            payload["entity_id"] = entity_ids
-            await self.hass.services.async_call(
-                domain or ent_domain,
-                service,
-                payload,
-                blocking=False,
+        own_batch = batch is None
+        if batch is None:
+            batch = ServiceBatch()
+        for call in calls:
+            batch.add_planned(
+                call,
+                on_error=self._record_call_failure,
+                on_sent=self._record_dispatch_delay,
+                on_superseded=self._record_superseded,
             )
+        if own_batch:
+            await batch.async_flush(self.hass)
+
+    def _drop_satisfied(self, calls: Iterable[PlannedCall], action: PlannedAction) -> list[PlannedCall]:
+        """Leave out targets whose current state already matches the action.
+
+        A cover that's already closed or a switch that's already off gets
+        nothing sent to it - on battery/mesh devices every call is airtime
+        and battery. Counted in calls_avoided/targets_skipped.
+
+        The reported state only counts if the last command the CommandQueue
+        got for the target was this same call (or there was none): a light
+        whose turn_on is still in flight, queued, or not yet reported back
+        still reads "off", and skipping its turn_off would leave it on.
+        """
+        if not action.checkable:
+            return list(calls)
+        queue = async_get_command_queue(self.hass)
+        remaining: list[PlannedCall] = []
+        for call in calls:
+            pending = [
+                entity_id
+                for entity_id in call.entity_ids
+                if queue.last_command(entity_id) not in (None, call.key)
+                or not already_satisfied(self.hass.states.get(entity_id), action.service, action.data)
+            ]
+            skipped = len(call.entity_ids) - len(pending)
+            if skipped:
+                self.logger.debug("Already in state for %s: %d of %s", action.service, skipped, call.entity_ids)
+            self.targets_skipped += skipped
+            restricted = call.restricted(pending)
+            if restricted is not None:
+                remaining.append(restricted)
+            else:
+                self.calls_avoided += 1
+        return remaining
+
+    @callback
+    def _record_dispatch_delay(self, entity_ids: list[str], delay: float) -> None:
+        """Note how long each target's command was held back (dispatch_delays)."""
+        own = self.plan.target_set
+        delays = {entity_id: round(delay, 1) for entity_id in entity_ids if entity_id in own}
+        if all(self._dispatch_delays.get(entity_id) == value for entity_id, value in delays.items()):
+            return
+        self._dispatch_delays.update(delays)
+        self._bump_revision()
+
+    @callback
+    def _record_superseded(self, entity_ids: list[str]) -> None:
+        self.commands_superseded += 1
+        self._bump_revision()
 
-    async def _async_fire(self, which: str) -> None:
+    @callback
+    def _record_call_failure(
+        self, domain: str, service: str, entity_ids: list[str], err: BaseException
+    ) -> None:
+        """Note a failed service call in the snapshot (call_failures)."""
+        own = self.plan.target_set
+        self.call_failures += 1
+        self._last_call_failure = {
+            "service": f"{domain}.{service}",
+            "entity_ids": [entity_id for entity_id in entity_ids if entity_id in own] or list(entity_ids),
+            "error": str(err) or type(err).__name__,
+            "at": self._format_datetime(dt_util.utcnow()),
+        }
+        self._bump_revision()
+
+    async def _async_fire(
+        self, which: str, batch: Optional[ServiceBatch] = None, reason: str = FIRE_SCHEDULED
+    ) -> None:
+        """Run track `which`'s action.
+
+        Only a scheduled fire is a run: catch-up and reconciliation re-send
+        an action at a time the schedule never set, so they're recorded in
+        `recovery` (with their reason) instead of stamping last_run.
+        """
         if not self.state.enabled:
             return
         if which in ("start2", "end2") and not self.state.second_enabled:
             return
 
-        if self._today_allowed():
-            if which in ("start", "start2"):
-                await self._call_targets(self.state.start_service, self.state.start_data)
-            else:
-                await self._call_targets(self.state.end_service, self.state.end_data)
+        # Fires are only ever armed for allowed weekdays (see
+        # OccurrenceCalendar / SolarEphemeris.next_fire), so no day check here.
+        action = self.plan.start if which in ("start", "start2") else self.plan.end
+        await self._call_targets(action, batch)
+        if reason == FIRE_SCHEDULED:
             self._last_run[which] = dt_util.utcnow()
-
-        # Keep the "next run" info fresh for fixed-time triggers.
-        # Solar triggers recompute in _schedule_next_solar_track.
-        for track_which, trigger, when, _ in self._track_definitions():
-            if track_which == which and trigger == TRIGGER_TIME:
-                self._next_fire[which] = self._compute_next_time_fire(when)
+        else:
+            self._last_recovery = {
+                "track": which,
+                "reason": reason,
+                "at": self._format_datetime(dt_util.utcnow()),
+            }
+        self._bump_revision()
+
+        if self.plan.verify:
+            # A newer fire makes the previous one's confirmation moot.
+            if self._verify_task is not None:
+                self._verify_task.cancel()
+            self._verify_task = self.hass.async_create_task(self._async_verify(which, action, reason))
 
         self._dispatch_updates()
 
-    async def _handle_start(self, now: dt.datetime) -> None:
-        await self._async_fire("start")
+    async def _async_verify(self, which: str, action: PlannedAction, reason: str = FIRE_SCHEDULED) -> None:
+        """Confirm a fire reached its targets; retry the ones it didn't.
+
+        blocking=False (and even a blocking call) only says the integration
+        accepted the command - a geyser's set_operation_mode can still go
+        nowhere. Every target whose action can be checked (see
+        state_checkable) is waited for concurrently, through state-change
+        events, for up to VERIFY_TIMEOUT (plus however long the dispatch
+        throttle may hold commands back). Those that don't get there are
+        re-sent up to VERIFY_RETRIES times, VERIFY_BACKOFF seconds apart,
+        doubling. The outcome lands in the snapshot as `verification`.
+        """
+        targets = list(self.plan.targets)
+        checkable = targets if action.checkable else []
+        outcome: dict[str, Any] = {
+            "track": which,
+            "reason": reason,
+            "at": self._format_datetime(dt_util.utcnow()),
+            "status": "pending",
+            "confirmed": [],
+            "retried": [],
+            "failed": [],
+            "unverified": [entity_id for entity_id in targets if entity_id not in checkable],
+        }
+        self._set_verification(outcome)
+
+        timeout = VERIFY_TIMEOUT + async_get_dispatch_throttle(self.hass).max_spread
+        confirmed = await async_wait_for_states(self.hass, checkable, action.service, action.data, timeout)
+        pending = [entity_id for entity_id in checkable if entity_id not in confirmed]
+        retried: set[str] = set()
+        for attempt in range(VERIFY_RETRIES):
+            if not pending:
+                break
+            await asyncio.sleep(VERIFY_BACKOFF * 2**attempt)
+            self.logger.info("Retrying %s for unconfirmed %s (attempt %d)", which, pending, attempt + 1)
+            retried.update(pending)
+            await self._call_targets(action, entity_ids=pending)
+            confirmed |= await async_wait_for_states(self.hass, pending, action.service, action.data, timeout)
+            pending = [entity_id for entity_id in pending if entity_id not in confirmed]
+
+        if pending:
+            self.logger.warning("%s not confirmed for %s after %d retries", which, pending, VERIFY_RETRIES)
+        if pending:
+            status = "failed"
+        elif confirmed:
+            status = "confirmed"
+        else:
+            # Nothing could be checked (see state_checkable).
+            status = "unverified"
+        self._verify_task = None
+        self._set_verification(
+            {
+                **outcome,
+                "status": status,
+                "confirmed": sorted(confirmed),
+                "retried": sorted(retried),
+                "failed": pending,
+            }
+        )
+
+    def _set_verification(self, outcome: dict[str, Any]) -> None:
+        self._last_verification = outcome
+        self._bump_revision()
 
-    async def _handle_end(self, now: dt.datetime) -> None:
-        await self._async_fire("end")
+    async def _handle_start(self, now: dt.datetime, batch: Optional[ServiceBatch] = None) -> None:
+        await self._async_fire("start", batch)
 
-    async def _handle_start2(self, now: dt.datetime) -> None:
-        await self._async_fire("start2")
+    async def _handle_end(self, now: dt.datetime, batch: Optional[ServiceBatch] = None) -> None:
+        await self._async_fire("end", batch)
 
-    async def _handle_end2(self, now: dt.datetime) -> None:
-        await self._async_fire("end2")
+    async def _handle_start2(self, now: dt.datetime, batch: Optional[ServiceBatch] = None) -> None:
+        await self._async_fire("start2", batch)
+
+    async def _handle_end2(self, now: dt.datetime, batch: Optional[ServiceBatch] = None) -> None:
+        await self._async_fire("end2", batch)
+
+    @property
+    def pending_options(self) -> dict[str, Any]:
+        """Entry options including edits still waiting in the mutation buffer."""
+        return self._mutations.options
+
+    @property
+    def pending_data(self) -> dict[str, Any]:
+        return self._mutations.data
+
+    async def async_mutate(
+        self,
+        *,
+        options: Optional[dict[str, Any]] = None,
+        data: Optional[dict[str, Any]] = None,
+        title: Optional[str] = None,
+    ) -> None:
+        """Merge changes into the entry and reload, batched with other edits.
+
+        See MutationBuffer: returns once the shared commit has been written
+        and the scheduler reloaded.
+        """
+        await self._mutations.async_submit(options=options, data=data, title=title)
 
     async def async_set_option(self, key: str, value: Any) -> None:
-        options = dict(self.entry.options or {})
-        options[key] = value
-        self.hass.config_entries.async_update_entry(self.entry, options=options)
-        await self.async_reload_from_entry()
+        await self.async_mutate(options={key: value})
 
     async def async_update_options(self, options: dict[str, Any]) -> None:
-        """Replace the config entry options wholesale and reload."""
-        self.hass.config_entries.async_update_entry(self.entry, options=dict(options))
-        await self.async_reload_from_entry()
+        """Merge `options` into the config entry options and reload."""
+        await self.async_mutate(options=dict(options))
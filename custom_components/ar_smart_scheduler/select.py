@@ -25,25 +25,37 @@ from .const import (
     TRIGGER_TYPES,
     WATER_HEATER_ACTIONS,
 )
-from .runtime_actions import build_runtime_action_updates, detect_device_type
+from .registry import async_prune_entities
+from .runtime_actions import build_runtime_action_updates
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     scheduler = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities(
-        [
-            SchedulerTriggerSelect(entry, scheduler, "Start Trigger", f"{DOMAIN}_{entry.entry_id}_start_trigger", CONF_START_TRIGGER, SIGNAL_START_UPDATED),
-            SchedulerTriggerSelect(entry, scheduler, "End Trigger", f"{DOMAIN}_{entry.entry_id}_end_trigger", CONF_END_TRIGGER, SIGNAL_END_UPDATED),
-            SchedulerTriggerSelect(entry, scheduler, "Second Start Trigger", f"{DOMAIN}_{entry.entry_id}_second_start_trigger", CONF_SECOND_START_TRIGGER, SIGNAL_START2_UPDATED, second=True),
-            SchedulerTriggerSelect(entry, scheduler, "Second End Trigger", f"{DOMAIN}_{entry.entry_id}_second_end_trigger", CONF_SECOND_END_TRIGGER, SIGNAL_END2_UPDATED, second=True),
-            SchedulerActionSelect(entry, scheduler, "Start HVAC Action", f"{DOMAIN}_{entry.entry_id}_climate_start_action", CONF_CLIMATE_START_ACTION, CLIMATE_ACTIONS, ("climate",), SIGNAL_START_UPDATED),
-            SchedulerActionSelect(entry, scheduler, "End HVAC Action", f"{DOMAIN}_{entry.entry_id}_climate_end_action", CONF_CLIMATE_END_ACTION, CLIMATE_ACTIONS, ("climate",), SIGNAL_END_UPDATED),
-            SchedulerActionSelect(entry, scheduler, "Start Water Heater Action", f"{DOMAIN}_{entry.entry_id}_water_heater_start_action", CONF_WATER_HEATER_START_ACTION, WATER_HEATER_ACTIONS, ("water_heater",), SIGNAL_START_UPDATED),
-            SchedulerActionSelect(entry, scheduler, "End Water Heater Action", f"{DOMAIN}_{entry.entry_id}_water_heater_end_action", CONF_WATER_HEATER_END_ACTION, WATER_HEATER_ACTIONS, ("water_heater",), SIGNAL_END_UPDATED),
-            SchedulerActionSelect(entry, scheduler, "Start Lock Action", f"{DOMAIN}_{entry.entry_id}_lock_start_action", CONF_LOCK_START_ACTION, LOCK_ACTIONS, ("lock",), SIGNAL_START_UPDATED),
-            SchedulerActionSelect(entry, scheduler, "End Lock Action", f"{DOMAIN}_{entry.entry_id}_lock_end_action", CONF_LOCK_END_ACTION, LOCK_ACTIONS, ("lock",), SIGNAL_END_UPDATED),
-        ]
-    )
+    entities = [
+        SchedulerTriggerSelect(entry, scheduler, "Start Trigger", f"{DOMAIN}_{entry.entry_id}_start_trigger", CONF_START_TRIGGER, SIGNAL_START_UPDATED),
+        SchedulerTriggerSelect(entry, scheduler, "End Trigger", f"{DOMAIN}_{entry.entry_id}_end_trigger", CONF_END_TRIGGER, SIGNAL_END_UPDATED),
+        SchedulerTriggerSelect(entry, scheduler, "Second Start Trigger", f"{DOMAIN}_{entry.entry_id}_second_start_trigger", CONF_SECOND_START_TRIGGER, SIGNAL_START2_UPDATED, second=True),
+        SchedulerTriggerSelect(entry, scheduler, "Second End Trigger", f"{DOMAIN}_{entry.entry_id}_second_end_trigger", CONF_SECOND_END_TRIGGER, SIGNAL_END2_UPDATED, second=True),
+        SchedulerActionSelect(entry, scheduler, "Start HVAC Action", f"{DOMAIN}_{entry.entry_id}_climate_start_action", CONF_CLIMATE_START_ACTION, CLIMATE_ACTIONS, ("climate",), SIGNAL_START_UPDATED),
+        SchedulerActionSelect(entry, scheduler, "End HVAC Action", f"{DOMAIN}_{entry.entry_id}_climate_end_action", CONF_CLIMATE_END_ACTION, CLIMATE_ACTIONS, ("climate",), SIGNAL_END_UPDATED),
+        SchedulerActionSelect(entry, scheduler, "Start Water Heater Action", f"{DOMAIN}_{entry.entry_id}_water_heater_start_action", CONF_WATER_HEATER_START_ACTION, WATER_HEATER_ACTIONS, ("water_heater",), SIGNAL_START_UPDATED),
+        SchedulerActionSelect(entry, scheduler, "End Water Heater Action", f"{DOMAIN}_{entry.entry_id}_water_heater_end_action", CONF_WATER_HEATER_END_ACTION, WATER_HEATER_ACTIONS, ("water_heater",), SIGNAL_END_UPDATED),
+        SchedulerActionSelect(entry, scheduler, "Start Lock Action", f"{DOMAIN}_{entry.entry_id}_lock_start_action", CONF_LOCK_START_ACTION, LOCK_ACTIONS, ("lock",), SIGNAL_START_UPDATED),
+        SchedulerActionSelect(entry, scheduler, "End Lock Action", f"{DOMAIN}_{entry.entry_id}_lock_end_action", CONF_LOCK_END_ACTION, LOCK_ACTIONS, ("lock",), SIGNAL_END_UPDATED),
+    ]
+    # Only the action controls for this scheduler's resolved device type -
+    # the others could never be anything but unavailable. A device type
+    # change reloads the entry (see _async_update_entry), and the pruning
+    # below drops the previous type's controls from the registry.
+    device_type = scheduler.entity_device_type
+    entities = [
+        entity
+        for entity in entities
+        if not isinstance(entity, SchedulerActionSelect) or device_type in entity._device_types
+    ]
+    created = {entity.unique_id for entity in entities}
+    async_prune_entities(hass, entry, lambda reg_entry: reg_entry.domain != "select" or reg_entry.unique_id in created)
+    async_add_entities(entities)
 
 
 class SchedulerTriggerSelect(SelectEntity):
@@ -110,7 +122,7 @@ class SchedulerActionSelect(SelectEntity):
 
     @property
     def available(self):
-        return detect_device_type(self.entry.options, self.entry.data) in self._device_types
+        return self.scheduler.plan.device_type in self._device_types
 
     @property
     def current_option(self):
@@ -119,7 +131,9 @@ class SchedulerActionSelect(SelectEntity):
     async def async_select_option(self, option: str):
         if option not in self._attr_options:
             return
-        updates = dict(self.entry.options or {})
+        # Built on the pending options so a second edit inside the
+        # mutation buffer's window doesn't undo the first.
+        updates = dict(self.scheduler.pending_options)
         updates[self._option_key] = option
-        updates.update(build_runtime_action_updates(updates, self.entry.data))
+        updates.update(build_runtime_action_updates(updates, self.scheduler.pending_data))
         await self.scheduler.async_update_options(updates)
@@ -1,18 +1,52 @@
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity
+import datetime as dt
+from collections.abc import Callable
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import CONF_NAME, DOMAIN, SIGNAL_UPDATED, TRIGGER_SUNRISE, TRIGGER_SUNSET
+from .const import CONF_NAME, DOMAIN, SIGNAL_INFO_UPDATED, TRIGGER_SUNRISE, TRIGGER_SUNSET
 
 
 class ARSchedulerInfo(SensorEntity):
     _attr_has_entity_name = True
     _attr_should_poll = False
     _attr_icon = "mdi:information-outline"
+    # The schedule's configuration, republished on every fire and option
+    # change - kept out of the recorder so history holds the state and
+    # solar statuses only. Next/last run times have their own timestamp
+    # sensors below.
+    _unrecorded_attributes = frozenset(
+        {
+            "schedule_name",
+            "target_entities",
+            "target_count",
+            "start_time",
+            "end_time",
+            "start_trigger",
+            "end_trigger",
+            "start_offset_minutes",
+            "end_offset_minutes",
+            "second_enabled",
+            "second_start_time",
+            "second_end_time",
+            "second_start_trigger",
+            "second_end_trigger",
+            "second_start_offset_minutes",
+            "second_end_offset_minutes",
+            "weekdays",
+            "start_service",
+            "end_service",
+            "start_data",
+            "end_data",
+            "sun_entity_id",
+            "sun_available",
+        }
+    )
 
     def __init__(self, entry: ConfigEntry, scheduler) -> None:
         self.entry = entry
@@ -24,7 +58,7 @@ class ARSchedulerInfo(SensorEntity):
     async def async_added_to_hass(self):
         self._unsub = async_dispatcher_connect(
             self.hass,
-            f"{SIGNAL_UPDATED}_{self.entry.entry_id}",
+            f"{SIGNAL_INFO_UPDATED}_{self.entry.entry_id}",
             self._handle_update,
         )
 
@@ -58,7 +92,7 @@ class ARSchedulerInfo(SensorEntity):
         )
         return {
             "schedule_name": self.entry.data.get(CONF_NAME, self.entry.title),
-            "target_entities": self.scheduler.targets,
+            "target_entities": list(self.scheduler.targets),
             "target_count": len(self.scheduler.targets),
             "start_time": snapshot["start_time"],
             "end_time": snapshot["end_time"],
@@ -80,14 +114,6 @@ class ARSchedulerInfo(SensorEntity):
             "end_data": snapshot["end_data"],
             "sun_entity_id": snapshot["sun_entity_id"],
             "sun_available": snapshot["sun_available"],
-            "next_start_run": snapshot["next_fire"]["start"],
-            "next_end_run": snapshot["next_fire"]["end"],
-            "next_second_start_run": snapshot["next_fire"]["start2"],
-            "next_second_end_run": snapshot["next_fire"]["end2"],
-            "last_start_run": snapshot["last_run"]["start"],
-            "last_end_run": snapshot["last_run"]["end"],
-            "last_second_start_run": snapshot["last_run"]["start2"],
-            "last_second_end_run": snapshot["last_run"]["end2"],
             "start_solar_status": start_status,
             "end_solar_status": end_status,
             "second_start_solar_status": second_start_status,
@@ -102,8 +128,73 @@ class ARSchedulerInfo(SensorEntity):
         return solar_message or "scheduled"
 
 
+class _SchedulerRunSensor(SensorEntity):
+    """Base for the Next Run / Last Run timestamp sensors."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        scheduler,
+        name: str,
+        key: str,
+        run: Callable[[], tuple[str | None, dt.datetime | None]],
+    ) -> None:
+        self.entry = entry
+        self.scheduler = scheduler
+        # The scheduler's (track, time) getter, e.g. scheduler.next_run.
+        self._run = run
+        self._attr_name = name
+        self._attr_unique_id = f"{entry.entry_id}_{key}"
+        self._unsub = None
+
+    async def async_added_to_hass(self):
+        self._unsub = async_dispatcher_connect(
+            self.hass,
+            f"{SIGNAL_INFO_UPDATED}_{self.entry.entry_id}",
+            self.async_write_ha_state,
+        )
+
+    async def async_will_remove_from_hass(self):
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    @property
+    def native_value(self) -> dt.datetime | None:
+        return self._run()[1]
+
+    @property
+    def extra_state_attributes(self):
+        # Which track ("start", "end", "start2", "end2") the time belongs to.
+        return {"track": self._run()[0]}
+
+
+class SchedulerNextRunSensor(_SchedulerRunSensor):
+    _attr_icon = "mdi:calendar-clock"
+
+    def __init__(self, entry: ConfigEntry, scheduler) -> None:
+        super().__init__(entry, scheduler, "Next Run", "next_run", scheduler.next_run)
+
+
+class SchedulerLastRunSensor(_SchedulerRunSensor):
+    _attr_icon = "mdi:history"
+
+    def __init__(self, entry: ConfigEntry, scheduler) -> None:
+        super().__init__(entry, scheduler, "Last Run", "last_run", scheduler.last_run)
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     scheduler = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([ARSchedulerInfo(entry, scheduler)])
+    async_add_entities(
+        [
+            ARSchedulerInfo(entry, scheduler),
+            SchedulerNextRunSensor(entry, scheduler),
+            SchedulerLastRunSensor(entry, scheduler),
+        ]
+    )
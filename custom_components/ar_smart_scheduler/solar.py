@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from collections.abc import Callable
+from typing import Optional
+
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE, SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.sun import get_astral_event_date
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_EPHEMERIS, TRIGGER_SUNRISE, TRIGGER_SUNSET
+from .occurrences import mask_allows
+
+_LOGGER = logging.getLogger(__name__)
+
+ASTRAL_EVENTS = {
+    TRIGGER_SUNRISE: SUN_EVENT_SUNRISE,
+    TRIGGER_SUNSET: SUN_EVENT_SUNSET,
+}
+
+# How far ahead to look for the next event before giving up. Long enough to
+# get through a full polar night/day at any latitude.
+SEARCH_DAYS = 366
+
+# Entries older than this many days before today are dropped from the cache.
+_CACHE_KEEP_DAYS = 2
+
+SolarListener = Callable[[set[str]], None]
+
+
+class SolarEphemeris:
+    """Sunrise/sunset for any date, computed locally for hass.config's location.
+
+    Replaces reading sun.sun's next_rising/next_setting, which only ever
+    knows the *next* event: a negative offset that put the fire in the past
+    had to be guessed as "+1 day" until sun.sun rolled over, and every
+    solar track reported "sun.sun is unavailable" at boot until the sun
+    integration loaded. Events come from HA's own astral helper (latitude,
+    longitude and elevation from hass.config) and are cached per
+    (trigger, date) for every scheduler to share, so a boot with hundreds
+    of solar schedulers computes each day's sunrise and sunset once.
+
+    Polar days and nights simply have no event on that date (None); the
+    search for the next fire skips ahead until the sun rises/sets again.
+
+    Schedulers subscribe by trigger so a location change (core config
+    update) can clear the cache and re-arm only the schedulers that use
+    solar triggers.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._cache: dict[tuple[str, dt.date], Optional[dt.datetime]] = {}
+        self._listeners: dict[str, dict[str, SolarListener]] = {
+            TRIGGER_SUNRISE: {},
+            TRIGGER_SUNSET: {},
+        }
+        self._unsub_config: Optional[CALLBACK_TYPE] = None
+
+    def event_on(self, trigger: str, day: dt.date) -> Optional[dt.datetime]:
+        """UTC sunrise/sunset for `day`, or None if the sun doesn't rise/set."""
+        key = (trigger, day)
+        if key in self._cache:
+            return self._cache[key]
+
+        event_time = get_astral_event_date(self.hass, ASTRAL_EVENTS[trigger], day)
+        if event_time is not None:
+            event_time = dt_util.as_utc(event_time)
+
+        if len(self._cache) > 4 * SEARCH_DAYS:
+            self._prune()
+        self._cache[key] = event_time
+        return event_time
+
+    def _prune(self) -> None:
+        horizon = dt_util.now().date() - dt.timedelta(days=_CACHE_KEEP_DAYS)
+        for key in [key for key in self._cache if key[1] < horizon]:
+            del self._cache[key]
+
+    def next_fire(
+        self,
+        trigger: str,
+        offset_minutes: int,
+        after: Optional[dt.datetime] = None,
+        mask: int = 0b1111111,
+    ) -> tuple[Optional[dt.datetime], Optional[dt.datetime], Optional[str]]:
+        """Return (scheduled_fire, base_event, message) for the first fire after `after`.
+
+        Only fires landing on a (local) weekday in `mask` are considered.
+        """
+        after = after or dt_util.utcnow()
+        offset = dt.timedelta(minutes=offset_minutes)
+
+        # Start a day early: a positive offset can push the fire for
+        # yesterday's (local) event past midnight into today.
+        day = dt_util.as_local(after - offset).date() - dt.timedelta(days=1)
+        for _ in range(SEARCH_DAYS + 2):
+            event_time = self.event_on(trigger, day)
+            if event_time is not None:
+                scheduled = event_time + offset
+                if scheduled > after and mask_allows(mask, dt_util.as_local(scheduled).date()):
+                    return scheduled, event_time, None
+            day += dt.timedelta(days=1)
+
+        return None, None, f"No {trigger} within {SEARCH_DAYS} days at this location"
+
+    def previous_fire(
+        self,
+        trigger: str,
+        offset_minutes: int,
+        before: Optional[dt.datetime] = None,
+        mask: int = 0b1111111,
+    ) -> Optional[dt.datetime]:
+        """Latest fire at or before `before` on a weekday in `mask`, or None."""
+        before = before or dt_util.utcnow()
+        offset = dt.timedelta(minutes=offset_minutes)
+
+        # Mirror of next_fire: start a day late, for negative offsets.
+        day = dt_util.as_local(before - offset).date() + dt.timedelta(days=1)
+        for _ in range(SEARCH_DAYS + 2):
+            event_time = self.event_on(trigger, day)
+            if event_time is not None:
+                scheduled = event_time + offset
+                if scheduled <= before and mask_allows(mask, dt_util.as_local(scheduled).date()):
+                    return scheduled
+            day -= dt.timedelta(days=1)
+        return None
+
+    @callback
+    def async_subscribe(self, entry_id: str, triggers: set[str], listener: SolarListener) -> CALLBACK_TYPE:
+        """Call `listener(changed_triggers)` when solar times for `triggers` change."""
+        for trigger in triggers:
+            self._listeners[trigger][entry_id] = listener
+
+        if self._unsub_config is None:
+            self._unsub_config = self.hass.bus.async_listen(
+                EVENT_CORE_CONFIG_UPDATE, self._handle_core_config_update
+            )
+
+        @callback
+        def _unsubscribe() -> None:
+            for trigger in triggers:
+                self._listeners[trigger].pop(entry_id, None)
+            if self._unsub_config is not None and not any(self._listeners.values()):
+                self._unsub_config()
+                self._unsub_config = None
+
+        return _unsubscribe
+
+    @callback
+    def _handle_core_config_update(self, event) -> None:
+        # Location/elevation/time zone may have changed - every cached event
+        # is suspect.
+        self._cache.clear()
+
+        notified: dict[str, tuple[SolarListener, set[str]]] = {}
+        for trigger, listeners in self._listeners.items():
+            for entry_id, listener in listeners.items():
+                notified.setdefault(entry_id, (listener, set()))[1].add(trigger)
+        _LOGGER.debug("Core config updated; re-resolving %d solar schedulers", len(notified))
+        for listener, triggers in notified.values():
+            listener(triggers)
+
+
+@callback
+def async_get_ephemeris(hass: HomeAssistant) -> SolarEphemeris:
+    """Return the integration-wide SolarEphemeris, creating it on first use."""
+    ephemeris: SolarEphemeris | None = hass.data.get(DATA_EPHEMERIS)
+    if ephemeris is None:
+        ephemeris = hass.data[DATA_EPHEMERIS] = SolarEphemeris(hass)
+    return ephemeris
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_RUNTIME_STORE, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.runtime"
+STORAGE_VERSION = 1
+
+# Seconds to hold changes before writing. Every scheduler due at the same
+# moment lands in the same write.
+SAVE_DELAY = 10
+
+# Per-track times each scheduler persists.
+RUNTIME_FIELDS = ("last_run", "next_fire", "solar_base")
+
+TrackTimes = dict[str, Optional[dt.datetime]]
+
+
+class RuntimeStore:
+    """Runtime state of every scheduler, in one .storage/ar_smart_scheduler.runtime.
+
+    Last run, pending fire and solar base times used to live in memory
+    only, so every restart reported "never ran" and forgot whether today's
+    start had already happened. Schedulers hand their times over here
+    whenever they change; the file is loaded once in async_setup and
+    written with Store.async_delay_save, so a wake-up that fires a hundred
+    schedulers still costs one disk write (Store also flushes anything
+    pending when HA shuts down).
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._schedulers: dict[str, dict[str, dict[str, Optional[str]]]] = {}
+
+    async def async_load(self) -> None:
+        try:
+            stored = await self._store.async_load()
+        except Exception:  # noqa: BLE001 - a corrupt file just means starting fresh
+            _LOGGER.exception("Could not read %s; starting with no runtime history", STORAGE_KEY)
+            stored = None
+        self._schedulers = dict((stored or {}).get("schedulers") or {})
+
+    def get(self, entry_id: str) -> dict[str, TrackTimes]:
+        """Persisted times for one scheduler, as {field: {track: datetime|None}}."""
+        record = self._schedulers.get(entry_id) or {}
+        return {
+            field: {
+                track: dt_util.parse_datetime(value) if value else None
+                for track, value in (record.get(field) or {}).items()
+            }
+            for field in RUNTIME_FIELDS
+        }
+
+    @callback
+    def async_update(self, entry_id: str, times: dict[str, TrackTimes]) -> None:
+        """Record one scheduler's current times; written on the next delayed save."""
+        record = {
+            field: {
+                track: value.isoformat() if value is not None else None
+                for track, value in times.get(field, {}).items()
+            }
+            for field in RUNTIME_FIELDS
+        }
+        if self._schedulers.get(entry_id) == record:
+            return
+        self._schedulers[entry_id] = record
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        if self._schedulers.pop(entry_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"schedulers": self._schedulers}
+
+
+@callback
+def async_get_runtime_store(hass: HomeAssistant) -> RuntimeStore:
+    """Return the integration-wide RuntimeStore, creating it on first use.
+
+    async_setup loads it before any entry is set up.
+    """
+    store: RuntimeStore | None = hass.data.get(DATA_RUNTIME_STORE)
+    if store is None:
+        store = hass.data[DATA_RUNTIME_STORE] = RuntimeStore(hass)
+    return store
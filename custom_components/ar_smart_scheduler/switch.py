@@ -4,11 +4,32 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .const import DOMAIN, CONF_ENABLED, CONF_WEEKDAYS, SIGNAL_UPDATED, WEEKDAY_MAP
+from .const import (
+    CONF_ENABLED,
+    CONF_LEAN,
+    CONF_WEEKDAYS,
+    DEFAULT_LEAN,
+    DEFAULT_WEEKDAYS,
+    DOMAIN,
+    SIGNAL_UPDATED,
+    WEEKDAY_MAP,
+)
+from .registry import async_prune_entities
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     scheduler = hass.data[DOMAIN][entry.entry_id]
+    if entry.options.get(CONF_LEAN, DEFAULT_LEAN):
+        # Lean mode: weekdays are edited from the card instead.
+        enabled = SchedulerEnabledSwitch(entry, scheduler)
+        async_prune_entities(
+            hass,
+            entry,
+            lambda reg_entry: reg_entry.domain != "switch" or reg_entry.unique_id == enabled.unique_id,
+        )
+        async_add_entities([enabled])
+        return
+
     async_add_entities([
         SchedulerEnabledSwitch(entry, scheduler),
         WeekdaySwitch(entry, scheduler, "mon"),
@@ -76,8 +97,14 @@ class WeekdaySwitch(_BaseSwitch):
     def is_on(self):
         return self.day_num in self.scheduler.state.weekdays
 
+    def _pending_days(self):
+        # Tapping several days in a row lands inside one mutation-buffer
+        # window, so start from the pending weekdays, not the loaded state.
+        keys = self.scheduler.pending_options.get(CONF_WEEKDAYS) or DEFAULT_WEEKDAYS
+        return {WEEKDAY_MAP[key] for key in keys if key in WEEKDAY_MAP}
+
     async def async_turn_on(self, **kwargs):
-        days = set(self.scheduler.state.weekdays)
+        days = self._pending_days()
         days.add(self.day_num)
         await self.scheduler.async_set_option(
             CONF_WEEKDAYS,
@@ -85,7 +112,7 @@ class WeekdaySwitch(_BaseSwitch):
         )
 
     async def async_turn_off(self, **kwargs):
-        days = set(self.scheduler.state.weekdays)
+        days = self._pending_days()
         days.discard(self.day_num)
         await self.scheduler.async_set_option(
             CONF_WEEKDAYS,
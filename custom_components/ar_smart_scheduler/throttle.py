@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .command_queue import async_get_command_queue
+from .const import DATA_THROTTLE
+
+if TYPE_CHECKING:
+    from .dispatch import BatchedCall
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_DISPATCH = "dispatch"
+CONF_SPREAD = "spread"
+CONF_MAX_CONCURRENT = "max_concurrent"
+CONF_PLATFORMS = "platforms"
+
+LANE_SCHEMA = vol.Schema(
+    {
+        # Seconds to spread one wake-up's commands for a lane over.
+        vol.Optional(CONF_SPREAD, default=0): vol.All(vol.Coerce(float), vol.Range(min=0, max=600)),
+        # Commands in flight at once per lane (0 = no limit).
+        vol.Optional(CONF_MAX_CONCURRENT, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+
+# ar_smart_scheduler:
+#   dispatch:
+#     spread: 0             # defaults, for every integration
+#     max_concurrent: 0
+#     platforms:
+#       zwave_js:           # keyed by the integration providing the entity
+#         spread: 30
+#         max_concurrent: 2
+DISPATCH_SCHEMA = LANE_SCHEMA.extend(
+    {vol.Optional(CONF_PLATFORMS, default={}): {str: LANE_SCHEMA}}
+)
+
+
+class Lane:
+    """Dispatch limits shared by every target of one integration."""
+
+    def __init__(self, spread: float, max_concurrent: int) -> None:
+        self.spread = spread
+        self.max_concurrent = max_concurrent
+        self._slots = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+
+    @property
+    def limited(self) -> bool:
+        return bool(self.spread or self._slots)
+
+    async def async_run(self, send: Callable[[], Awaitable[None]]) -> None:
+        if self._slots is None:
+            await send()
+            return
+        async with self._slots:
+            await send()
+
+
+@dataclass
+class _Command:
+    call: BatchedCall
+    platform: str
+    entity_ids: list[str]
+    offset: float = 0.0
+
+
+class DispatchThrottle:
+    """Integration-wide pacing of service calls, per integration (platform).
+
+    At sunset 50 covers on one Z-Wave stick all close in the same heap
+    wake-up; even merged into one cover.close_cover call, that's 50 radio
+    commands queued on the controller at once, some of which it drops.
+    Every ServiceBatch flush goes through here. Targets of an integration
+    with limits configured (see DISPATCH_SCHEMA) are sent one command each,
+    staggered evenly across the lane's spread window - ordered by entity_id
+    so the same targets get the same slot every time - with at most
+    max_concurrent in flight. The lane (and its semaphore) is shared by
+    every scheduler, which is where the contention is. Targets of other
+    integrations keep the merged call.
+
+    Either way the calls are handed to the per-target CommandQueue (see
+    command_queue.py), which sends them and reports the delay actually
+    applied to each target (including any wait for a slot or for the
+    target's previous command) through BatchedCall.on_sent.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._default = Lane(0, 0)
+        self._lanes: dict[str, Lane] = {}
+
+    @callback
+    def async_configure(self, config: dict[str, Any]) -> None:
+        self._default = Lane(config.get(CONF_SPREAD, 0), config.get(CONF_MAX_CONCURRENT, 0))
+        self._lanes = {
+            platform: Lane(lane.get(CONF_SPREAD, 0), lane.get(CONF_MAX_CONCURRENT, 0))
+            for platform, lane in (config.get(CONF_PLATFORMS) or {}).items()
+        }
+
+    @property
+    def active(self) -> bool:
+        return self._default.limited or any(lane.limited for lane in self._lanes.values())
+
+    @property
+    def max_spread(self) -> float:
+        """Longest a command can be held back by its lane's spread window."""
+        return max([self._default.spread, *(lane.spread for lane in self._lanes.values())])
+
+    def _lane(self, platform: str) -> Lane:
+        return self._lanes.get(platform, self._default)
+
+    def _split(self, calls: Iterable[BatchedCall]) -> list[_Command]:
+        """One command per unthrottled (call, platform), one per throttled target."""
+        registry = er.async_get(self.hass)
+        commands: list[_Command] = []
+        for call in calls:
+            by_platform: dict[str, list[str]] = {}
+            for entity_id in call.entity_ids:
+                reg_entry = registry.async_get(entity_id)
+                platform = reg_entry.platform if reg_entry is not None else entity_id.split(".", 1)[0]
+                by_platform.setdefault(platform, []).append(entity_id)
+            for platform, entity_ids in by_platform.items():
+                if self._lane(platform).limited:
+                    commands.extend(_Command(call, platform, [entity_id]) for entity_id in entity_ids)
+                else:
+                    commands.append(_Command(call, platform, entity_ids))
+        return commands
+
+    async def async_send(self, calls: list[BatchedCall]) -> None:
+        """Send a batch's merged calls, staggering the throttled lanes."""
+        queue = async_get_command_queue(self.hass)
+        started = time.monotonic()
+        if not self.active:
+            await asyncio.gather(*(queue.async_send(call, call.entity_ids, started) for call in calls))
+            return
+
+        commands = self._split(calls)
+        by_lane: dict[str, list[_Command]] = {}
+        for command in commands:
+            if self._lane(command.platform).limited:
+                by_lane.setdefault(command.platform, []).append(command)
+        for platform, lane_commands in by_lane.items():
+            spread = self._lane(platform).spread
+            lane_commands.sort(key=lambda command: (command.entity_ids[0], command.call.service))
+            for index, command in enumerate(lane_commands):
+                command.offset = spread * index / len(lane_commands)
+
+        await asyncio.gather(*(self._async_run(command, started) for command in commands))
+
+    async def _async_run(self, command: _Command, started: float) -> None:
+        queue = async_get_command_queue(self.hass)
+        lane = self._lane(command.platform)
+        if not lane.limited:
+            await queue.async_send(command.call, command.entity_ids, started)
+            return
+        if command.offset:
+            await asyncio.sleep(command.offset)
+
+        async def _send() -> None:
+            await queue.async_send(command.call, command.entity_ids, started)
+
+        await lane.async_run(_send)
+
+
+@callback
+def async_get_dispatch_throttle(hass: HomeAssistant) -> DispatchThrottle:
+    """Return the integration-wide DispatchThrottle, creating it on first use.
+
+    Unconfigured, it sends every call straight away - async_setup applies
+    the `dispatch:` YAML options, if any.
+    """
+    throttle: DispatchThrottle | None = hass.data.get(DATA_THROTTLE)
+    if throttle is None:
+        throttle = hass.data[DATA_THROTTLE] = DispatchThrottle(hass)
+    return throttle
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import datetime as dt
+import heapq
+import itertools
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_TIMER_HEAP
+from .dispatch import ServiceBatch
+
+_LOGGER = logging.getLogger(__name__)
+
+# A wake-up this far past a fire's deadline means HA was stalled or the
+# clock jumped. The fire still runs (late beats never); it's just logged.
+LATE_GRACE = dt.timedelta(minutes=5)
+
+FireJob = Callable[[dt.datetime, ServiceBatch], Awaitable[None]]
+TimerKey = tuple[str, str]
+
+
+class TimerHeap:
+    """Every pending scheduler fire in the integration, behind one loop timer.
+
+    Each ARScheduler used to arm up to four timers of its own (and a fresh
+    one after every solar fire), so a few hundred schedulers meant thousands
+    of loop timers, each woken separately by HA's time-pattern machinery.
+    Schedulers now register a (deadline, job) per (entry_id, which) here
+    instead; exactly one async_track_point_in_utc_time is armed, for the
+    earliest deadline, and every key due at that moment is dispatched from
+    the same wake-up.
+
+    Re-scheduling or cancelling a key only replaces/drops its entry in
+    `_jobs` - the superseded heap tuple is left in place and discarded
+    lazily once it reaches the top, so both are O(log n).
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._heap: list[tuple[dt.datetime, int, TimerKey]] = []
+        self._jobs: dict[TimerKey, tuple[dt.datetime, int, FireJob]] = {}
+        self._seq = itertools.count()
+        self._unsub_timer: Optional[CALLBACK_TYPE] = None
+        self._armed_for: Optional[dt.datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def deadline(self, entry_id: str, which: str) -> Optional[dt.datetime]:
+        job = self._jobs.get((entry_id, which))
+        return job[0] if job is not None else None
+
+    @callback
+    def async_schedule(self, entry_id: str, which: str, when: dt.datetime, job: FireJob) -> None:
+        """Arm (or re-arm) the fire for one scheduler track."""
+        key = (entry_id, which)
+        when = dt_util.as_utc(when)
+        seq = next(self._seq)
+        self._jobs[key] = (when, seq, job)
+        heapq.heappush(self._heap, (when, seq, key))
+        self._async_arm()
+
+    @callback
+    def async_cancel(self, entry_id: str, which: str) -> None:
+        if self._jobs.pop((entry_id, which), None) is not None:
+            self._async_arm()
+
+    @callback
+    def async_cancel_entry(self, entry_id: str) -> None:
+        """Drop every pending fire belonging to one scheduler."""
+        stale = [key for key in self._jobs if key[0] == entry_id]
+        for key in stale:
+            del self._jobs[key]
+        if stale:
+            self._async_arm()
+
+    def _prune(self) -> None:
+        """Discard superseded/cancelled tuples sitting at the top of the heap."""
+        while self._heap:
+            _when, seq, key = self._heap[0]
+            job = self._jobs.get(key)
+            if job is not None and job[1] == seq:
+                return
+            heapq.heappop(self._heap)
+
+    @callback
+    def _async_arm(self) -> None:
+        self._prune()
+        earliest = self._heap[0][0] if self._heap else None
+        if earliest == self._armed_for:
+            return
+
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+        self._armed_for = earliest
+        if earliest is not None:
+            self._unsub_timer = async_track_point_in_utc_time(self.hass, self._async_wake, earliest)
+
+    @callback
+    def _async_wake(self, now: dt.datetime) -> None:
+        self._unsub_timer = None
+        self._armed_for = None
+
+        now = dt_util.utcnow()
+        due: list[tuple[TimerKey, FireJob]] = []
+        late = False
+        while True:
+            self._prune()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            when, _seq, key = heapq.heappop(self._heap)
+            due.append((key, self._jobs.pop(key)[2]))
+            late = late or now - when > LATE_GRACE
+
+        # Re-arm before running anything: jobs re-schedule their own next
+        # fire, and those calls must see a consistent heap.
+        self._async_arm()
+
+        if due:
+            if late:
+                _LOGGER.warning("Timer wake-up more than %s late; running the overdue fires now", LATE_GRACE)
+            self.hass.async_create_task(self._async_run_due(due, now))
+
+    async def _async_run_due(self, due: list[tuple[TimerKey, FireJob]], now: dt.datetime) -> None:
+        """Run every fire due in this wake-up, then send their calls as one batch."""
+        batch = ServiceBatch()
+        for (entry_id, which), job in due:
+            _LOGGER.debug("Dispatching %s fire for %s", which, entry_id)
+            try:
+                await job(now, batch)
+            except Exception:  # noqa: BLE001 - one broken scheduler mustn't block the others
+                _LOGGER.exception("%s fire for %s failed", which, entry_id)
+        await batch.async_flush(self.hass)
+
+
+@callback
+def async_get_timer_heap(hass: HomeAssistant) -> TimerHeap:
+    """Return the integration-wide TimerHeap, creating it on first use."""
+    timers: TimerHeap | None = hass.data.get(DATA_TIMER_HEAP)
+    if timers is None:
+        timers = hass.data[DATA_TIMER_HEAP] = TimerHeap(hass)
+    return timers
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .runtime_actions import already_satisfied
+
+_LOGGER = logging.getLogger(__name__)
+
+# Verified dispatch (CONF_VERIFY): how long to wait for targets to reach the
+# state their action implies, and the retries (after VERIFY_BACKOFF,
+# doubling each time) for those that don't.
+VERIFY_TIMEOUT = 30
+VERIFY_RETRIES = 3
+VERIFY_BACKOFF = 5
+
+
+async def async_wait_for_states(
+    hass: HomeAssistant,
+    entity_ids: Iterable[str],
+    service: str,
+    data: dict[str, Any],
+    timeout: float,
+) -> set[str]:
+    """Wait until each target's state satisfies `service`/`data`; return those that did.
+
+    Purely event-driven: targets already in the right state count straight
+    away, the rest are watched with one state-change listener for all of
+    them, and whatever hasn't matched by `timeout` is left out.
+    """
+    waiting = set(entity_ids)
+    confirmed = {
+        entity_id
+        for entity_id in waiting
+        if already_satisfied(hass.states.get(entity_id), service, data)
+    }
+    waiting -= confirmed
+    if not waiting:
+        return confirmed
+
+    done = hass.loop.create_future()
+
+    @callback
+    def _state_changed(event: Event) -> None:
+        entity_id = event.data["entity_id"]
+        if entity_id not in waiting:
+            return
+        if not already_satisfied(event.data.get("new_state"), service, data):
+            return
+        waiting.discard(entity_id)
+        confirmed.add(entity_id)
+        if not waiting and not done.done():
+            done.set_result(None)
+
+    unsub = async_track_state_change_event(hass, list(waiting), _state_changed)
+    try:
+        await asyncio.wait_for(done, timeout)
+    except asyncio.TimeoutError:
+        _LOGGER.debug("No confirmation of %s within %ss for %s", service, timeout, sorted(waiting))
+    finally:
+        unsub()
+    return confirmed
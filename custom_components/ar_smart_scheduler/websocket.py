@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
 
 import voluptuous as vol
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.components import websocket_api
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 from .config_flow import (
     _detect_type,
@@ -18,41 +20,34 @@ from .config_flow import (
 from .const import (
     CONF_DEVICE_TYPE,
     CONF_END,
-    CONF_ENABLED,
-    CONF_END_DATA,
     CONF_END_OFFSET,
-    CONF_END_SERVICE,
     CONF_END_TRIGGER,
+    CONF_LEAN,
     CONF_NAME,
-    CONF_SECOND_ENABLED,
-    CONF_SECOND_END,
-    CONF_SECOND_END_OFFSET,
-    CONF_SECOND_END_TRIGGER,
-    CONF_SECOND_START,
-    CONF_SECOND_START_OFFSET,
-    CONF_SECOND_START_TRIGGER,
     CONF_START,
-    CONF_START_DATA,
     CONF_START_OFFSET,
-    CONF_START_SERVICE,
     CONF_START_TRIGGER,
     CONF_TARGET_ENTITY,
     CONF_WEEKDAYS,
-    DEFAULT_START,
-    DEFAULT_END,
-    DEFAULT_SECOND_END,
-    DEFAULT_SECOND_START,
-    DEFAULT_WEEKDAYS,
     DEVICE_TYPES,
     DOMAIN,
-    DEFAULT_END_SERVICE,
-    DEFAULT_END_DATA,
-    DEFAULT_START_SERVICE,
-    DEFAULT_START_DATA,
+    SIGNAL_SCHEDULER_CHANGED,
     SUPPORTED_ENTITY_DOMAINS,
     TRIGGER_TYPES,
     WEEKDAY_KEYS,
 )
+from .bulk import (
+    BULK_UPDATE_FIELDS,
+    CONF_ENTRY_IDS,
+    CONF_FILTER,
+    CONF_OPTIONS,
+    OPTION_PATCH_FIELDS,
+    OPTION_PATCH_KEYS,
+    apply_option_patch,
+    async_bulk_update,
+    require_selection,
+)
+from .revisions import async_get_revision_log
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -73,19 +68,92 @@ def _get_entry(hass: HomeAssistant, entry_id: str) -> ConfigEntry | None:
     return entry
 
 
-async def _reload_scheduler(hass: HomeAssistant, entry: ConfigEntry) -> None:
+def _build_snapshots(
+    hass: HomeAssistant, since: int | None = None, entry_ids: Iterable[str] | None = None
+) -> list[dict]:
+    """Snapshots of every scheduler (or just `entry_ids`), newer than `since` if given.
+
+    A broken snapshot for one scheduler is logged and left out rather than
+    failing the whole reply - see ws_list's docstring for why that matters.
+    """
+    schedulers = hass.data.get(DOMAIN, {})
+    if entry_ids is None:
+        entry_ids = list(schedulers)
+
+    items = []
+    for entry_id in entry_ids:
+        build = getattr(schedulers.get(entry_id), "build_state_snapshot", None)
+        if not callable(build):
+            continue
+        if since is not None and getattr(schedulers[entry_id], "revision", since + 1) <= since:
+            continue
+        try:
+            items.append(build())
+        except Exception:  # noqa: BLE001 - one bad entry shouldn't hide all the rest
+            _LOGGER.exception("Failed to build state snapshot for entry %s", entry_id)
+    return items
+
+
+def _full_listing(items: list[dict]) -> dict:
+    return {
+        "full": True,
+        "schedulers": items,
+        # Lets the card build its "add schedule" entity picker and
+        # device-type dropdown from the same source of truth the
+        # backend validates against, instead of a hardcoded copy.
+        "domains": SUPPORTED_ENTITY_DOMAINS,
+        "device_types": DEVICE_TYPES,
+    }
+
+
+async def _async_mutate(hass: HomeAssistant, entry: ConfigEntry, **changes) -> None:
+    """Write changes through the scheduler's mutation buffer (mutations.py).
+
+    That batches them with any other edit to the same entry made within the
+    commit window and reloads the scheduler once. An entry with no running
+    scheduler (e.g. its setup failed) has nothing to batch with or reload,
+    so it's simply written.
+    """
+    scheduler = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if scheduler is None:
+        hass.config_entries.async_update_entry(entry, **changes)
+        return
+    await scheduler.async_mutate(**changes)
+
+
+def _pending_options(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    scheduler = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    return scheduler.pending_options if scheduler is not None else dict(entry.options or {})
+
+
+def _pending_data(hass: HomeAssistant, entry: ConfigEntry) -> dict:
     scheduler = hass.data.get(DOMAIN, {}).get(entry.entry_id)
-    if scheduler is not None:
-        await scheduler.async_reload_from_entry()
+    return scheduler.pending_data if scheduler is not None else dict(entry.data or {})
 
 
 @callback
 def async_register_ws(hass: HomeAssistant) -> None:
-    @websocket_api.websocket_command({vol.Required("type"): f"{DOMAIN}/list"})
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): f"{DOMAIN}/list",
+            # Delta cursor: the "epoch"/"revision" pair from a previous reply.
+            vol.Optional("epoch"): str,
+            vol.Optional("since"): vol.All(int, vol.Range(min=0)),
+        }
+    )
     @callback
     def ws_list(hass: HomeAssistant, connection, msg) -> None:
         """Return live snapshots of every scheduler (used by the Lovelace card).
 
+        Without a cursor (or with one this HA run can't serve - a different
+        epoch, or older than the oldest kept tombstone) the reply is the
+        full list, flagged "full": true. With a usable cursor it only
+        carries schedulers created or changed since then plus the entry_ids
+        of deleted ones, and just {"unchanged": true} when nothing moved -
+        the card calls this after every edit it makes (live updates come
+        from ar_smart_scheduler/subscribe), so an idle install shouldn't
+        have to re-serialise every scheduler each time.
+
         This is a plain (non-async_response) @callback handler, so nothing
         wraps it to convert an unhandled exception into a websocket error
         reply the way @websocket_api.async_response does for the other
@@ -101,34 +169,86 @@ def async_register_ws(hass: HomeAssistant) -> None:
         response instead of silence.
         """
         try:
+            revisions = async_get_revision_log(hass)
+            since = msg.get("since")
+            delta = since is not None and revisions.can_delta(msg.get("epoch"), since)
+            cursor = {"epoch": revisions.epoch, "revision": revisions.revision}
+
             schedulers = hass.data.get(DOMAIN, {})
-            items = []
-            for entry_id, value in schedulers.items():
-                build = getattr(value, "build_state_snapshot", None)
-                if not callable(build):
-                    continue
-                try:
-                    items.append(build())
-                except Exception:  # noqa: BLE001 - one bad entry shouldn't hide all the rest
-                    _LOGGER.exception(
-                        "ar_smart_scheduler/list: failed to build state snapshot for entry %s",
-                        entry_id,
+            items = _build_snapshots(hass, since=since if delta else None)
+
+            if delta:
+                removed = [
+                    entry_id for entry_id in revisions.removed_since(since) if entry_id not in schedulers
+                ]
+                if not items and not removed:
+                    connection.send_result(msg["id"], {**cursor, "unchanged": True})
+                else:
+                    connection.send_result(
+                        msg["id"], {**cursor, "schedulers": items, "removed": removed}
                     )
+                return
+
+            connection.send_result(msg["id"], {**cursor, **_full_listing(items)})
+        except Exception:  # noqa: BLE001 - always answer the card, even on a bug here
+            _LOGGER.exception("ar_smart_scheduler/list: failed to build response")
+            connection.send_error(msg["id"], "unknown_error", "Failed to list schedulers - see the HA log")
 
-            connection.send_result(
+    @websocket_api.websocket_command({vol.Required("type"): f"{DOMAIN}/subscribe"})
+    @callback
+    def ws_subscribe(hass: HomeAssistant, connection, msg) -> None:
+        """Push scheduler snapshots to the card instead of having it poll.
+
+        The first event is the same full listing ar_smart_scheduler/list
+        returns; after that every event is a patch - the snapshots of
+        schedulers that changed (a fire, an options edit, a solar time
+        moving) plus the entry_ids of removed ones - carrying the same
+        epoch/revision cursor, so the card can still fall back to a delta
+        list call. Changes are collected per loop iteration, so a timer
+        wake-up that fires forty schedulers is one event, not forty.
+        """
+        pending: dict[str, None] = {}
+
+        @callback
+        def _send_patch() -> None:
+            entry_ids = list(pending)
+            pending.clear()
+            schedulers = hass.data.get(DOMAIN, {})
+            revisions = async_get_revision_log(hass)
+            connection.send_message(
+                websocket_api.event_message(
+                    msg["id"],
+                    {
+                        "epoch": revisions.epoch,
+                        "revision": revisions.revision,
+                        "schedulers": _build_snapshots(hass, entry_ids=entry_ids),
+                        "removed": [entry_id for entry_id in entry_ids if entry_id not in schedulers],
+                    },
+                )
+            )
+
+        @callback
+        def _scheduler_changed(entry_id: str) -> None:
+            if not pending:
+                hass.loop.call_soon(_send_patch)
+            pending[entry_id] = None
+
+        connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+            hass, SIGNAL_SCHEDULER_CHANGED, _scheduler_changed
+        )
+        connection.send_result(msg["id"])
+
+        revisions = async_get_revision_log(hass)
+        connection.send_message(
+            websocket_api.event_message(
                 msg["id"],
                 {
-                    "schedulers": items,
-                    # Lets the card build its "add schedule" entity picker and
-                    # device-type dropdown from the same source of truth the
-                    # backend validates against, instead of a hardcoded copy.
-                    "domains": SUPPORTED_ENTITY_DOMAINS,
-                    "device_types": DEVICE_TYPES,
+                    "epoch": revisions.epoch,
+                    "revision": revisions.revision,
+                    **_full_listing(_build_snapshots(hass)),
                 },
             )
-        except Exception:  # noqa: BLE001 - always answer the card, even on a bug here
-            _LOGGER.exception("ar_smart_scheduler/list: failed to build response")
-            connection.send_error(msg["id"], "unknown_error", "Failed to list schedulers - see the HA log")
+        )
 
     # Deliberately not @require_admin: clients get their own non-admin HA
     # account for the dashboard and need to be able to run the scheduler
@@ -144,26 +264,7 @@ def async_register_ws(hass: HomeAssistant) -> None:
         {
             vol.Required("type"): f"{DOMAIN}/set_options",
             vol.Required("entry_id"): str,
-            vol.Optional(CONF_START): str,
-            vol.Optional(CONF_END): str,
-            vol.Optional(CONF_START_TRIGGER): vol.In(TRIGGER_TYPES),
-            vol.Optional(CONF_END_TRIGGER): vol.In(TRIGGER_TYPES),
-            vol.Optional(CONF_START_OFFSET): int,
-            vol.Optional(CONF_END_OFFSET): int,
-            vol.Optional(CONF_WEEKDAYS): [vol.In(WEEKDAY_KEYS)],
-            vol.Optional(CONF_ENABLED): bool,
-            vol.Optional(CONF_SECOND_ENABLED): bool,
-            vol.Optional(CONF_SECOND_START): str,
-            vol.Optional(CONF_SECOND_END): str,
-            vol.Optional(CONF_SECOND_START_TRIGGER): vol.In(TRIGGER_TYPES),
-            vol.Optional(CONF_SECOND_END_TRIGGER): vol.In(TRIGGER_TYPES),
-            vol.Optional(CONF_SECOND_START_OFFSET): int,
-            vol.Optional(CONF_SECOND_END_OFFSET): int,
-            # advanced internal (not required for your customer UI)
-            vol.Optional(CONF_START_SERVICE): str,
-            vol.Optional(CONF_END_SERVICE): str,
-            vol.Optional(CONF_START_DATA): dict,
-            vol.Optional(CONF_END_DATA): dict,
+            **OPTION_PATCH_FIELDS,
         }
     )
     @websocket_api.async_response
@@ -173,51 +274,41 @@ def async_register_ws(hass: HomeAssistant) -> None:
             connection.send_error(msg["id"], "not_found", _ERROR_MESSAGES["not_found"])
             return
 
-        opts = dict(entry.options or {})
-        if CONF_START in msg:
-            opts[CONF_START] = msg[CONF_START] or DEFAULT_START
-        if CONF_END in msg:
-            opts[CONF_END] = msg[CONF_END] or DEFAULT_END
-        if CONF_START_TRIGGER in msg:
-            opts[CONF_START_TRIGGER] = msg[CONF_START_TRIGGER]
-        if CONF_END_TRIGGER in msg:
-            opts[CONF_END_TRIGGER] = msg[CONF_END_TRIGGER]
-        if CONF_START_OFFSET in msg:
-            opts[CONF_START_OFFSET] = int(msg[CONF_START_OFFSET])
-        if CONF_END_OFFSET in msg:
-            opts[CONF_END_OFFSET] = int(msg[CONF_END_OFFSET])
-        if CONF_WEEKDAYS in msg:
-            opts[CONF_WEEKDAYS] = msg[CONF_WEEKDAYS] or DEFAULT_WEEKDAYS
-        if CONF_ENABLED in msg:
-            opts[CONF_ENABLED] = bool(msg[CONF_ENABLED])
-        if CONF_SECOND_ENABLED in msg:
-            opts[CONF_SECOND_ENABLED] = bool(msg[CONF_SECOND_ENABLED])
-        if CONF_SECOND_START in msg:
-            opts[CONF_SECOND_START] = msg[CONF_SECOND_START] or DEFAULT_SECOND_START
-        if CONF_SECOND_END in msg:
-            opts[CONF_SECOND_END] = msg[CONF_SECOND_END] or DEFAULT_SECOND_END
-        if CONF_SECOND_START_TRIGGER in msg:
-            opts[CONF_SECOND_START_TRIGGER] = msg[CONF_SECOND_START_TRIGGER]
-        if CONF_SECOND_END_TRIGGER in msg:
-            opts[CONF_SECOND_END_TRIGGER] = msg[CONF_SECOND_END_TRIGGER]
-        if CONF_SECOND_START_OFFSET in msg:
-            opts[CONF_SECOND_START_OFFSET] = int(msg[CONF_SECOND_START_OFFSET])
-        if CONF_SECOND_END_OFFSET in msg:
-            opts[CONF_SECOND_END_OFFSET] = int(msg[CONF_SECOND_END_OFFSET])
-
-        if CONF_START_SERVICE in msg:
-            opts[CONF_START_SERVICE] = msg[CONF_START_SERVICE] or DEFAULT_START_SERVICE
-        if CONF_END_SERVICE in msg:
-            opts[CONF_END_SERVICE] = msg[CONF_END_SERVICE] or DEFAULT_END_SERVICE
-        if CONF_START_DATA in msg:
-            opts[CONF_START_DATA] = msg[CONF_START_DATA] or dict(DEFAULT_START_DATA)
-        if CONF_END_DATA in msg:
-            opts[CONF_END_DATA] = msg[CONF_END_DATA] or dict(DEFAULT_END_DATA)
-
-        hass.config_entries.async_update_entry(entry, options=opts)
-        await _reload_scheduler(hass, entry)
-
-        connection.send_result(msg["id"], {"ok": True, "options": opts})
+        opts = apply_option_patch(
+            _pending_options(hass, entry), {key: msg[key] for key in OPTION_PATCH_KEYS if key in msg}
+        )
+
+        await _async_mutate(hass, entry, options=opts)
+
+        connection.send_result(msg["id"], {"ok": True, "options": dict(entry.options)})
+
+    # Not @require_admin - see the note on ws_set_options above.
+    @websocket_api.websocket_command(
+        # See the note on ws_create below: must be vol.All(...) with the
+        # vol.Schema first.
+        vol.All(
+            vol.Schema({vol.Required("type"): f"{DOMAIN}/bulk_update", **BULK_UPDATE_FIELDS}),
+            require_selection,
+        )
+    )
+    @websocket_api.async_response
+    async def ws_bulk_update(hass: HomeAssistant, connection, msg) -> None:
+        """Apply one option patch to many schedulers in a single request.
+
+        Same patch format as set_options, but for a list of entry_ids or a
+        filter (see bulk.FILTER_SCHEMA) - "holiday hours for the whole
+        building" in one round trip rather than one set_options per
+        scheduler. Replies with a result per entry_id; see
+        bulk.async_bulk_update for how writes and reloads are kept to one
+        per entry.
+        """
+        results = await async_bulk_update(
+            hass,
+            msg[CONF_OPTIONS],
+            entry_ids=msg.get(CONF_ENTRY_IDS),
+            criteria=msg.get(CONF_FILTER),
+        )
+        connection.send_result(msg["id"], {"ok": True, "results": results})
 
     # Not @require_admin - see the note on ws_set_options above.
     @websocket_api.websocket_command(
@@ -301,6 +392,8 @@ def async_register_ws(hass: HomeAssistant) -> None:
             vol.Optional(CONF_NAME): str,
             vol.Optional(CONF_TARGET_ENTITY): [str],
             vol.Optional(CONF_DEVICE_TYPE): vol.In(DEVICE_TYPES),
+            # Changes which entities exist, so the entry is fully reloaded.
+            vol.Optional(CONF_LEAN): bool,
         }
     )
     @websocket_api.async_response
@@ -311,11 +404,16 @@ def async_register_ws(hass: HomeAssistant) -> None:
             connection.send_error(msg["id"], "not_found", _ERROR_MESSAGES["not_found"])
             return
 
-        name = str(msg.get(CONF_NAME, entry.data.get(CONF_NAME, entry.title or "Scheduler"))).strip() or "Scheduler"
+        data = _pending_data(hass, entry)
+        options = _pending_options(hass, entry)
+        name = str(msg.get(CONF_NAME, data.get(CONF_NAME, entry.title or "Scheduler"))).strip() or "Scheduler"
         entity_ids = _normalize_entity_ids(
-            msg.get(CONF_TARGET_ENTITY, entry.data.get(CONF_TARGET_ENTITY))
+            msg.get(CONF_TARGET_ENTITY, data.get(CONF_TARGET_ENTITY))
         )
-        device_type_setting = msg.get(CONF_DEVICE_TYPE, entry.options.get(CONF_DEVICE_TYPE, "auto"))
+        device_type_setting = msg.get(CONF_DEVICE_TYPE, options.get(CONF_DEVICE_TYPE, "auto"))
+        general_options = {CONF_DEVICE_TYPE: device_type_setting}
+        if CONF_LEAN in msg:
+            general_options[CONF_LEAN] = msg[CONF_LEAN]
 
         if not entity_ids:
             connection.send_error(msg["id"], "required", _ERROR_MESSAGES["required"])
@@ -327,16 +425,13 @@ def async_register_ws(hass: HomeAssistant) -> None:
             connection.send_error(msg["id"], "already_configured", _ERROR_MESSAGES["already_configured"])
             return
 
-        opts = dict(entry.options or {})
-        opts[CONF_DEVICE_TYPE] = device_type_setting
-
-        hass.config_entries.async_update_entry(
+        await _async_mutate(
+            hass,
             entry,
             title=name,
             data={CONF_NAME: name, CONF_TARGET_ENTITY: entity_ids},
-            options=opts,
+            options=general_options,
         )
-        await _reload_scheduler(hass, entry)
 
         connection.send_result(msg["id"], {"ok": True, "name": name, "target_entity": entity_ids})
 
@@ -368,11 +463,11 @@ def async_register_ws(hass: HomeAssistant) -> None:
             connection.send_error(msg["id"], "not_found", _ERROR_MESSAGES["not_found"])
             return
 
-        opts = dict(entry.options or {})
+        opts = _pending_options(hass, entry)
         device_type_setting = msg.get(CONF_DEVICE_TYPE, opts.get(CONF_DEVICE_TYPE, "auto"))
         opts[CONF_DEVICE_TYPE] = device_type_setting
 
-        entity_ids = _normalize_entity_ids(entry.data.get(CONF_TARGET_ENTITY))
+        entity_ids = _normalize_entity_ids(_pending_data(hass, entry).get(CONF_TARGET_ENTITY))
         resolved_type = _detect_type(entity_ids) if device_type_setting == "auto" else device_type_setting
 
         action_fields = {
@@ -380,13 +475,14 @@ def async_register_ws(hass: HomeAssistant) -> None:
         }
         opts.update(_resolve_action_options(resolved_type, action_fields))
 
-        hass.config_entries.async_update_entry(entry, options=opts)
-        await _reload_scheduler(hass, entry)
+        await _async_mutate(hass, entry, options=opts)
 
-        connection.send_result(msg["id"], {"ok": True, "options": opts})
+        connection.send_result(msg["id"], {"ok": True, "options": dict(entry.options)})
 
     websocket_api.async_register_command(hass, ws_list)
+    websocket_api.async_register_command(hass, ws_subscribe)
     websocket_api.async_register_command(hass, ws_set_options)
+    websocket_api.async_register_command(hass, ws_bulk_update)
     websocket_api.async_register_command(hass, ws_create)
     websocket_api.async_register_command(hass, ws_delete)
     websocket_api.async_register_command(hass, ws_set_general)